@@ -8,15 +8,25 @@ Run:
 
 Or with uvicorn directly:
     uv run uvicorn app:app --host 0.0.0.0 --port 8082 --reload
+
+Environment:
+    DEV_RELOAD=1        Restart the server on code changes (development only).
+    WEB_CONCURRENCY=N   Number of worker processes (default 1). Computation
+                        status is kept in-process, so keep this at 1 unless
+                        running behind a process manager, e.g.:
+                        gunicorn -k uvicorn.workers.UvicornWorker -w 4 app:app
 """
 
+import asyncio
+import os
 import sys
+from contextlib import asynccontextmanager
 
-from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse
 
-from src.config import APP_NAME, UI_DIR, setup_logging
-from src.api.routes import router as api_router
+from src.config import APP_NAME, INCLUDE_SYFT_OPENAPI, UI_DIR, setup_logging
+from src.api.responses import ORJSONResponse
+from src.api.static import CachedStaticFiles
 from src.preflight import run_preflight
 
 # Setup logging
@@ -39,28 +49,66 @@ if not _pf.ok:
 from fastsyftbox import FastSyftBox
 from syft_core import SyftClientConfig
 
-_cfg = SyftClientConfig.load()
+
+@asynccontextmanager
+async def lifespan(app):
+    """
+    Import and register the API routes at startup rather than at import time.
+
+    The route modules pull in numpy/pandas and the FL services; deferring them
+    keeps `import app` (and `--reload` restarts) cheap.
+    """
+    from src.api.routes import router as api_router
+    from src.services.interaction_logs import interaction_log_writer
+
+    app.include_router(api_router)
+
+    # Interaction logs are buffered; flush them periodically and on shutdown.
+    flush_task = asyncio.create_task(interaction_log_writer.run_periodic_flush())
+    try:
+        yield
+    finally:
+        flush_task.cancel()
+        interaction_log_writer.close()
+
+
+# Reuse the config preflight already parsed instead of loading it twice.
+_cfg = _pf.config or SyftClientConfig.load()
 app = FastSyftBox(
     app_name=APP_NAME,
     syftbox_config=_cfg,
+    lifespan=lifespan,
     syftbox_endpoint_tags=["syftbox"],
-    include_syft_openapi=True,
+    include_syft_openapi=INCLUDE_SYFT_OPENAPI,
+    default_response_class=ORJSONResponse,
 )
 
-# Mount static UI folder
+# Mount static UI folder (preloaded into memory, with Cache-Control/ETag so reloads revalidate via 304)
 if UI_DIR.exists():
-    app.mount("/static", StaticFiles(directory=str(UI_DIR), html=True), name="static")
-
-# Include API routes
-app.include_router(api_router)
+    app.mount(
+        "/static",
+        CachedStaticFiles(directory=str(UI_DIR), html=True, check_dir=False),
+        name="static",
+    )
 
+    # The redirect never changes, so build it once and reuse it for every request.
+    _ROOT_REDIRECT = RedirectResponse(url="/static/index.html", status_code=307)
 
-@app.get("/", include_in_schema=False)
-async def root_redirect():
-    """Redirect root to the main UI."""
-    return RedirectResponse(url="/static/index.html")
+    @app.get("/", include_in_schema=False)
+    async def root_redirect():
+        """Redirect root to the main UI."""
+        return _ROOT_REDIRECT
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("app:app", host="0.0.0.0", port=8082)
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=8082,
+        # uvloop is not available on Windows; fall back to the asyncio loop there.
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        reload=os.getenv("DEV_RELOAD", "").lower() in ("1", "true", "yes"),
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
@@ -7,7 +7,13 @@ V = np.array([[5.0, -3.0], [0.2, 0.1], [2.0, 1.0]])
 U = np.array([0.1, 0.05])
 
 vocab = {"A":0, "B":1, "C":2}
-activity = np.array([['A',51,1,3.0]], dtype=object)
+# Typed activity columns (title, week, n_watched, rating)
+activity = {
+    "title": np.array(["A"], dtype=object),
+    "week": np.array([51], dtype=np.int32),
+    "n_watched": np.array([1], dtype=np.int32),
+    "rating": np.array([3.0], dtype=np.float32),
+}
 
 print("Raw scores (no normalization):")
 raw, _ = compute_recommendations(U, V, vocab, activity, recent_week=51, exclude_watched=False, score_normalization=None, normalize_item_factors=False)
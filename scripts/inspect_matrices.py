@@ -6,8 +6,10 @@ This script attempts to use src.core to discover SyftBox paths. If that fails
 it falls back to the common ~/.syftbox paths. It prints presence, shapes, norms,
 min/max/mean and a small sample of values for U and global_V.
 """
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import json
+import os
 import sys
 
 try:
@@ -20,34 +22,63 @@ except Exception:
 import numpy as np
 
 
-def inspect_array(path: Path):
-    print(f"\nInspecting: {path}")
-    if not path.exists():
-        print("  MISSING")
-        return
+_dir_index_cache: dict = {}
+
+
+def index_dir(p: Path) -> dict:
+    """Map entry names to os.DirEntry for a directory (one scandir pass, cached)."""
+    key = str(p)
+    if key not in _dir_index_cache:
+        try:
+            _dir_index_cache[key] = {e.name: e for e in os.scandir(p)}
+        except OSError:
+            _dir_index_cache[key] = {}
+    return _dir_index_cache[key]
+
+
+def path_exists(path: Path) -> bool:
+    """Check existence via the cached directory index instead of a stat() call."""
+    return path.name in index_dir(path.parent)
+
+
+def inspect_array(path: Path) -> str:
+    """Build a text report for one .npy file (safe to run from worker threads)."""
+    lines = [f"\nInspecting: {path}"]
+    if not path_exists(path):
+        lines.append("  MISSING")
+        return "\n".join(lines)
     try:
-        arr = np.load(path, allow_pickle=True)
+        # Memory-map so only the header and the pages touched by the reductions are read.
+        arr = np.load(path, mmap_mode="r")
+    except ValueError:
+        # Object arrays (pickled) cannot be memory-mapped.
+        try:
+            arr = np.load(path, allow_pickle=True)
+        except Exception as e:
+            lines.append(f"  Could not load npy: {e}")
+            return "\n".join(lines)
     except Exception as e:
-        print(f"  Could not load npy: {e}")
-        return
+        lines.append(f"  Could not load npy: {e}")
+        return "\n".join(lines)
     if isinstance(arr, np.ndarray):
-        print(f"  type: ndarray, shape: {arr.shape}")
+        lines.append(f"  type: ndarray, shape: {arr.shape}")
         try:
-            flat = arr.astype(float).ravel()
-            print(f"  dtype: {arr.dtype}, len: {flat.size}")
-            print(f"  norm: {np.linalg.norm(flat):.6f}")
-            print(f"  min: {flat.min():.6f}, max: {flat.max():.6f}, mean: {flat.mean():.6f}")
-            sample = flat[:10]
-            print(f"  sample (first 10): {sample.tolist()}")
+            flat = arr.reshape(-1)
+            lines.append(f"  dtype: {arr.dtype}, len: {flat.size}")
+            lines.append(f"  norm: {float(np.linalg.norm(flat)):.6f}")
+            lines.append(f"  min: {float(flat.min()):.6f}, max: {float(flat.max()):.6f}, mean: {float(flat.mean(dtype=np.float64)):.6f}")
+            sample = np.asarray(flat[:10], dtype=float)
+            lines.append(f"  sample (first 10): {sample.tolist()}")
         except Exception as e:
-            print(f"  Could not summarize array values: {e}")
+            lines.append(f"  Could not summarize array values: {e}")
     else:
-        print(f"  Loaded object type: {type(arr)}")
+        lines.append(f"  Loaded object type: {type(arr)}")
         try:
             if isinstance(arr, dict):
-                print(f"  dict keys (sample): {list(arr.keys())[:10]}")
+                lines.append(f"  dict keys (sample): {list(arr.keys())[:10]}")
         except Exception:
             pass
+    return "\n".join(lines)
 
 
 def main():
@@ -85,20 +116,26 @@ def main():
         v_candidates.append(Path(shared) / "global_V.npy")
     v_candidates.append(fallback_shared / "global_V.npy")
 
+    # Candidates may live on slow/remote filesystems: inspect them concurrently,
+    # then print the reports in the original order.
+    candidates = [Path(p) for p in u_candidates + v_candidates]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        reports = list(executor.map(inspect_array, candidates))
+
     print("\nChecking U candidates:")
-    for p in u_candidates:
-        inspect_array(Path(p))
+    for report in reports[:len(u_candidates)]:
+        print(report)
 
     print("\nChecking global_V candidates:")
-    for p in v_candidates:
-        inspect_array(Path(p))
+    for report in reports[len(u_candidates):]:
+        print(report)
 
     print("\nCheck for vocabulary.json in shared folder(s):")
     if shared:
         p = Path(shared) / "vocabulary.json"
-        print(f"  {p} -> exists: {p.exists()}")
+        print(f"  {p} -> exists: {path_exists(p)}")
     p = fallback_shared / "vocabulary.json"
-    print(f"  {p} -> exists: {p.exists()}")
+    print(f"  {p} -> exists: {path_exists(p)}")
 
     print("\nDone.")
 
@@ -0,0 +1,18 @@
+"""JSON responses encoded with orjson."""
+
+from typing import Any
+
+import orjson
+from starlette.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSONResponse encoded with orjson.
+
+    A local replacement for FastAPI's deprecated ORJSONResponse. Numpy values
+    and non-string dict keys are serialized the same way.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
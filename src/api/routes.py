@@ -1,13 +1,20 @@
 """API route handlers."""
 
+import asyncio
 import csv
 import logging
+import os
+import shutil
+import threading
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
+import orjson
 from fastapi import APIRouter, BackgroundTasks, UploadFile, File
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 
+from src.api.responses import ORJSONResponse
 from src.config import APP_NAME, AGGREGATOR_DATASITE
 from src.core import (
     get_client,
@@ -16,9 +23,13 @@ from src.core import (
 )
 from src.preflight import PreflightError, run_preflight
 from src.services.enrichment import enrich_recommendation
-from src.services.io import recommendations_exist, load_recommendations
+from src.services.interaction_logs import interaction_log_writer
+from src.services.io import (
+    recommendations_exist,
+    load_recommendations_indexed,
+)
 from src.services.recommendations import (
-    run_recommendation_computation,
+    submit_recommendation_computation,
     get_computation_status,
     set_pending_click_history,
 )
@@ -32,25 +43,63 @@ from src.services.federated_learning import (
 
 router = APIRouter(prefix="/api")
 
+# Uploads are streamed to disk in chunks of this size instead of read whole.
+UPLOAD_CHUNK_SIZE = 1 << 20
+# Normalize line endings (Windows \r\n / old Mac \r -> \n); the blank lines
+# this produces for \r\n are dropped together with any other empty lines.
+_CR_TO_LF = bytes.maketrans(b"\r", b"\n")
+
+
+# Interaction log files (in the restricted folder the aggregator can read)
+_RECS_CSV = "recommendations.csv"
+_FEEDBACK_CSV = "feedback.csv"
+_OPT_OUT_CSV = "opt_out.csv"
+_SETTINGS_CSV = "settings.csv"
+
+# Header rows of the interaction logs (/watchlist and /choice share one schema)
+_RECS_HEADER = ("timestamp", "user", "rank", "page", "visible_items", "column", "title", "action")
+_FEEDBACK_HEADER = ("timestamp", "user", "rating", "feedback")
+_OPT_OUT_HEADER = ("timestamp", "user", "reason", "user_message")
+_SETTINGS_HEADER = (
+    "timestamp", "user",
+    "showMoreDetails", "useReranked", "showWhyRecommended",
+    "enableWatchlist", "enableBlockItems", "showActivityCharts",
+    "showWatchlistStatus",
+)
+# Accepted `action` values for /watchlist
+_VALID_ACTIONS = frozenset({"will_watch", "wont_watch"})
+
 
-def _preflight_error_response(e: Exception) -> JSONResponse:
+class UploadValidationError(ValueError):
+    """Raised when an uploaded viewing history CSV is not usable."""
+
+
+def _preflight_error_response(e: Exception) -> ORJSONResponse:
     """
     Convert setup/runtime prerequisite failures into actionable API responses.
 
     We use 503 so the UI can treat it as a dependency-not-ready condition.
     """
-    return JSONResponse(
+    return ORJSONResponse(
         {
             "status": "error",
             "error_type": "prerequisite_not_ready",
             "message": str(e),
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now(),
         },
         status_code=503,
     )
 
 
-def _ensure_csv_has_header(csv_file_path: Path, header_row: list[str]) -> None:
+# Interaction logs whose header has already been checked in this process.
+# Guarded by a lock since background tasks may log concurrently.
+_verified_headers: set[Path] = set()
+_verified_headers_lock = threading.Lock()
+# A log replaced on disk (e.g. by sync) gets its header checked again
+interaction_log_writer.on_reopen = _verified_headers.discard
+
+
+def _ensure_csv_has_header(csv_file_path: Path, header_row: tuple[str, ...]) -> None:
     """
     Ensure a CSV exists and has the expected header as the first row.
 
@@ -58,35 +107,182 @@ def _ensure_csv_has_header(csv_file_path: Path, header_row: list[str]) -> None:
     If it exists but is empty, it is overwritten with the header.
     If it exists but has a different first row, the file is rewritten with the
     expected header prepended (keeping existing content).
-    """
-    csv_file_path.parent.mkdir(parents=True, exist_ok=True)
 
-    if not csv_file_path.exists():
-        with open(csv_file_path, "w", newline="", encoding="utf-8") as f:
-            csv.writer(f).writerow(header_row)
+    Once a file has been checked it is remembered, so later calls return
+    without touching the file.
+    """
+    if csv_file_path in _verified_headers:
         return
 
-    # Read the first row (if any) and the remainder verbatim.
-    with open(csv_file_path, "r", newline="", encoding="utf-8") as f:
-        reader = csv.reader(f)
-        first_row = next(reader, None)
-        rest = f.read()
+    with _verified_headers_lock:
+        if csv_file_path in _verified_headers:
+            return
 
-    # Empty file: overwrite with header
-    if not first_row:
-        with open(csv_file_path, "w", newline="", encoding="utf-8") as f:
-            csv.writer(f).writerow(header_row)
-        return
+        csv_file_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Already correct
-    if first_row == header_row:
-        return
+        if not csv_file_path.exists():
+            with open(csv_file_path, "w", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerow(header_row)
+            _verified_headers.add(csv_file_path)
+            return
+
+        # Only the first line is needed to check the header.
+        tmp_path = csv_file_path.with_name(csv_file_path.name + ".tmp")
+        with open(csv_file_path, "r", newline="", encoding="utf-8") as f:
+            first_line = f.readline()
+
+            # Already correct (compared as parsed fields, so quoting doesn't matter)
+            if tuple(next(csv.reader([first_line]), ())) == tuple(header_row):
+                _verified_headers.add(csv_file_path)
+                return
+
+            # Rewrite with header + original content (including original first line),
+            # copying the remainder across in chunks rather than reading it whole.
+            # An empty file just gets the header.
+            with open(tmp_path, "w", newline="", encoding="utf-8") as out:
+                csv.writer(out).writerow(header_row)
+                if first_line.strip():
+                    out.write(first_line)
+                    # A last line without a newline would get the next row appended to it
+                    if not first_line.endswith("\n"):
+                        out.write("\n")
+                    shutil.copyfileobj(f, out)
+
+        os.replace(tmp_path, csv_file_path)
+        _verified_headers.add(csv_file_path)
+
+
+# Enriched recommendation lists, reused while the loaded recommendations are unchanged:
+# (raw list they were built from, (enriched_raw, enriched_reranked))
+_enriched_recommendations_cache = None
+
+
+def _get_enriched_recommendations():
+    """
+    Return the enriched (raw, re-ranked) recommendation lists.
+
+    `load_recommendations_indexed` returns the same list objects until the
+    recommendation files change, so enrichment only reruns after a recompute.
+    """
+    global _enriched_recommendations_cache
+
+    raw_recommends, reranked_recommends, _ = load_recommendations_indexed()
+    cache = _enriched_recommendations_cache
+    if cache is not None and cache[0] is raw_recommends:
+        return cache[1]
+
+    enriched = (
+        [enrich_recommendation(item) for item in raw_recommends],
+        [enrich_recommendation(item) for item in reranked_recommends],
+    )
+    _enriched_recommendations_cache = (raw_recommends, enriched)
+    return enriched
+
+
+def _write_interaction_row(csv_file_path: Path, header_row: tuple[str, ...], row: list) -> None:
+    """Blocking part of logging an interaction: check the header, then append the row."""
+    _ensure_csv_has_header(csv_file_path, header_row)
+    interaction_log_writer.append_row(csv_file_path, row, header=header_row)
+
+
+@lru_cache(maxsize=None)
+def _interaction_log_path(filename: str) -> Path:
+    """
+    Resolve the path of an interaction log CSV.
+
+    NOTE: Do NOT write into the aggregator's `shared/` folder, since that is publicly readable.
+    Logs go into our own restricted app_data folder with permissions granting the aggregator
+    read access. The first call pays for `setup_environment`; later calls reuse the Path.
+    """
+    _, restricted_public_folder, _ = setup_environment("profile_0")
+    return restricted_public_folder / "interaction_logs" / filename
+
+
+# Constant leading part of the /health body; only the preflight info and
+# timestamp are serialized per request.
+_HEALTH_PREFIX = orjson.dumps({"status": "healthy", "app_name": APP_NAME})[:-1] + b","
+
+
+@lru_cache(maxsize=1)
+def _user_response_prefix() -> bytes:
+    """
+    Pre-serialized /user body up to the timestamp value.
+
+    The email and app name don't change while the app runs, so they are encoded
+    once (after SyftBox is ready; failures are not cached).
+    """
+    client = get_client()
+    return orjson.dumps({"email": client.email, "app_name": APP_NAME})[:-1] + b',"timestamp":'
+
+
+@lru_cache(maxsize=None)
+def _global_v_path(profile: str) -> str:
+    """Resolve (once per profile) the path of the aggregator's global_V.npy."""
+    restricted_shared_folder, _, _ = setup_environment(profile)
+    return str(restricted_shared_folder / "global_V.npy")
+
+
+@lru_cache(maxsize=1)
+def _mtime_to_datetime(mtime: float) -> datetime:
+    """Convert a file mtime to a datetime, reusing the result while the mtime is unchanged."""
+    return datetime.fromtimestamp(mtime)
+
+
+def _validate_upload_header(header_line: str) -> None:
+    """Check that the CSV header line has a "Title" column."""
+    header = next(csv.reader([header_line]))
+    header_lower = [col.lower().strip() for col in header]
+    if 'title' not in header_lower:
+        raise UploadValidationError(
+            "CSV must have a 'Title' column. Netflix viewing history format expected."
+        )
+
+
+async def _stream_csv_upload(file: UploadFile, dest: Path) -> int:
+    """
+    Stream an uploaded CSV to `dest` without holding the whole file in memory.
+
+    Line endings are normalized, empty lines are dropped and the header is
+    validated as soon as it arrives.
+
+    Returns:
+        int: Number of data rows written (excluding the header).
+    """
+    line_count = 0
+    pending = b""
+    with open(dest, "wb") as out:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if chunk:
+                data = pending + chunk.translate(_CR_TO_LF)
+                cut = data.rfind(b"\n")
+                if cut == -1:
+                    pending = data
+                    continue
+                # Only complete lines are processed; a "\n" never splits a UTF-8 sequence.
+                block, pending = data[:cut], data[cut + 1:]
+            else:
+                block, pending = pending, b""
+
+            # Lines stay as bytes and are written back unchanged; decoding is only
+            # needed to reject non-UTF-8 input and to parse the header.
+            block.decode("utf-8")
+            lines = [line for line in block.split(b"\n") if line.strip()]
+            if lines:
+                if line_count == 0:
+                    lines[0] = lines[0].lstrip()
+                    _validate_upload_header(lines[0].decode("utf-8"))
+                else:
+                    out.write(b"\n")
+                out.write(b"\n".join(lines))
+                line_count += len(lines)
+
+            if not chunk:
+                break
 
-    # Rewrite with header + original content (including original first line)
-    with open(csv_file_path, "w", newline="", encoding="utf-8") as f:
-        csv.writer(f).writerow(header_row)
-        f.write(",".join(first_row) + "\n")
-        f.write(rest)
+    if line_count == 0:
+        raise UploadValidationError("CSV file is empty")
+    return line_count - 1
 
 
 @router.get("/health")
@@ -95,16 +291,15 @@ async def api_health():
     # Always return healthy if the server is running, but include preflight info
     # so users can see exactly what is missing (SyftBox config, env vars, etc).
     pf = run_preflight()
-    return JSONResponse(
+    body = orjson.dumps(
         {
-            "status": "healthy",
-            "app_name": APP_NAME,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now(),
             "preflight_ok": pf.ok,
             "preflight_message": pf.message,
             "preflight_checks": pf.checks,
         }
     )
+    return Response(_HEALTH_PREFIX + body[1:], media_type="application/json")
 
 
 @router.get("/data/status")
@@ -112,12 +307,12 @@ async def api_data_status():
     """Check if Netflix viewing history exists."""
     try:
         data_status = check_viewing_history_exists()
-        return JSONResponse(
+        return ORJSONResponse(
             {
                 "has_data": data_status["exists"],
                 "source": data_status["source"],
                 "path": data_status["path"],
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": datetime.now(),
             }
         )
     except (PreflightError, Exception) as e:
@@ -141,69 +336,50 @@ async def api_upload_history(file: UploadFile = File(...)):
 
         # Validate file type
         if not file.filename.endswith('.csv'):
-            return JSONResponse({
+            return ORJSONResponse({
                 "status": "error",
                 "message": "File must be a CSV"
             }, status_code=400)
         
-        # Read file content and normalize line endings
-        content = await file.read()
-        content_str = content.decode('utf-8')
-        # Normalize line endings (Windows \r\n -> Unix \n)
-        content_str = content_str.replace('\r\n', '\n').replace('\r', '\n')
-        
-        # Validate CSV has Title column
-        lines = [line for line in content_str.strip().split('\n') if line.strip()]
-        if not lines:
-            return JSONResponse({
-                "status": "error",
-                "message": "CSV file is empty"
-            }, status_code=400)
-        
-        # Parse header
-        reader = csv.reader([lines[0]])
-        header = next(reader)
-        header_lower = [col.lower().strip() for col in header]
-        
-        if 'title' not in header_lower:
-            return JSONResponse({
-                "status": "error",
-                "message": "CSV must have a 'Title' column. Netflix viewing history format expected."
-            }, status_code=400)
-        
-        # Save to private path (with cleaned content - no empty lines)
         private_path = get_private_path()
         private_path.mkdir(parents=True, exist_ok=True)
-        
         save_path = private_path / "NetflixViewingHistory.csv"
-        # Write cleaned lines (no empty lines, normalized line endings)
-        cleaned_content = '\n'.join(lines)
-        with open(save_path, 'w', encoding='utf-8', newline='') as f:
-            f.write(cleaned_content)
-        
-        # Count rows (excluding header)
-        row_count = len(lines) - 1
+
+        # Stream into a temporary file and only replace the existing history once
+        # the upload has been fully validated.
+        partial_path = save_path.with_name(save_path.name + ".part")
+        try:
+            row_count = await _stream_csv_upload(file, partial_path)
+            os.replace(partial_path, save_path)
+            check_viewing_history_exists.cache_clear()
+        finally:
+            partial_path.unlink(missing_ok=True)
         
         logging.info(f"Uploaded Netflix viewing history: {save_path} ({row_count} entries)")
         
-        return JSONResponse({
+        return ORJSONResponse({
             "status": "success",
             "message": f"Successfully uploaded {row_count} viewing history entries",
             "path": str(save_path),
             "row_count": row_count,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         })
         
     except PreflightError as e:
         return _preflight_error_response(e)
+    except UploadValidationError as e:
+        return ORJSONResponse({
+            "status": "error",
+            "message": str(e)
+        }, status_code=400)
     except UnicodeDecodeError:
-        return JSONResponse({
+        return ORJSONResponse({
             "status": "error",
             "message": "Could not decode file. Please ensure it's a valid UTF-8 CSV."
         }, status_code=400)
     except Exception as e:
         logging.error(f"Upload error: {e}")
-        return JSONResponse({
+        return ORJSONResponse({
             "status": "error",
             "message": str(e)
         }, status_code=500)
@@ -221,7 +397,7 @@ async def api_status():
 
         # FL workflow status takes precedence over simple computation
         if fl_status["status"] in ["running", "fine_tuning"]:
-            return JSONResponse(
+            return ORJSONResponse(
                 {
                     "status": fl_status["status"],
                     "has_recommendations": has_recommendations,
@@ -233,7 +409,7 @@ async def api_status():
 
         # Check for FL errors
         if fl_status["status"] == "error":
-            return JSONResponse(
+            return ORJSONResponse(
                 {
                     "status": "error",
                     "error_type": fl_status.get("error_type", "error"),
@@ -245,7 +421,7 @@ async def api_status():
             )
 
         if computation_status["status"] == "computing":
-            return JSONResponse(
+            return ORJSONResponse(
                 {
                     "status": "computing",
                     "has_recommendations": has_recommendations,
@@ -257,7 +433,7 @@ async def api_status():
 
         # Check for computation errors
         if computation_status["status"] == "error":
-            return JSONResponse(
+            return ORJSONResponse(
                 {
                     "status": "error",
                     "error_type": computation_status.get("error_type", "error"),
@@ -269,7 +445,7 @@ async def api_status():
             )
 
         if has_recommendations:
-            return JSONResponse(
+            return ORJSONResponse(
                 {
                     "status": "ready",
                     "has_recommendations": True,
@@ -279,7 +455,7 @@ async def api_status():
                 }
             )
 
-        return JSONResponse(
+        return ORJSONResponse(
             {
                 "status": "pending",
                 "has_recommendations": False,
@@ -298,17 +474,14 @@ async def api_status():
 async def api_recommendations():
     """Fetch current recommendations with full details."""
     if not recommendations_exist():
-        return JSONResponse({
+        return ORJSONResponse({
             "error": "No recommendations available",
             "status": "pending"
         }, status_code=404)
     
     try:
         client = get_client()
-        raw_recommends, reranked_recommends = load_recommendations()
-        
-        enriched_raw = [enrich_recommendation(item) for item in raw_recommends]
-        enriched_reranked = [enrich_recommendation(item) for item in reranked_recommends]
+        enriched_raw, enriched_reranked = _get_enriched_recommendations()
         
         # Debug: log sample raw_score values to help diagnose UI percentage display
         try:
@@ -319,18 +492,18 @@ async def api_recommendations():
         except Exception as e:
             logging.debug(f"Could not log sample scores: {e}")
         
-        return JSONResponse({
+        return ORJSONResponse({
             "status": "success",
             "raw_recommendations": enriched_raw,
             "reranked_recommendations": enriched_reranked,
             "user_email": client.email,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         })
     except PreflightError as e:
         return _preflight_error_response(e)
     except Exception as e:
         logging.error(f"Error fetching recommendations: {e}")
-        return JSONResponse({
+        return ORJSONResponse({
             "error": str(e),
             "status": "error"
         }, status_code=500)
@@ -344,29 +517,17 @@ async def api_movie_details(movie_id: int):
     Used by the modal to display full details when clicking on history items.
     """
     if not recommendations_exist():
-        return JSONResponse({
+        return ORJSONResponse({
             "error": "No recommendations available",
             "status": "pending"
         }, status_code=404)
     
     try:
-        raw_recommends, reranked_recommends = load_recommendations()
-        
-        # Search in both lists for the movie
-        item = None
-        for rec in raw_recommends:
-            if rec.get("id") == movie_id:
-                item = rec
-                break
+        _, _, recommendations_by_id = load_recommendations_indexed()
+        item = recommendations_by_id.get(movie_id)
         
         if not item:
-            for rec in reranked_recommends:
-                if rec.get("id") == movie_id:
-                    item = rec
-                    break
-        
-        if not item:
-            return JSONResponse({
+            return ORJSONResponse({
                 "error": f"Movie with ID {movie_id} not found",
                 "status": "not_found"
             }, status_code=404)
@@ -374,29 +535,29 @@ async def api_movie_details(movie_id: int):
         # Enrich the item with full details
         enriched_item = enrich_recommendation(item)
         
-        return JSONResponse({
+        return ORJSONResponse({
             "status": "success",
             "item": enriched_item,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         })
         
     except Exception as e:
         logging.error(f"Error fetching movie details: {e}")
-        return JSONResponse({
+        return ORJSONResponse({
             "error": str(e),
             "status": "error"
         }, status_code=500)
 
 
 @router.post("/recommendations/compute")
-async def api_compute_recommendations(background_tasks: BackgroundTasks, data: dict = None):
+async def api_compute_recommendations(data: dict = None):
     """Trigger recommendation computation in the background."""
     try:
         _ = get_client()
         status = get_computation_status()
 
         if status["status"] == "computing":
-            return JSONResponse(
+            return ORJSONResponse(
                 {
                     "status": "already_computing",
                     "message": "Computation is already in progress",
@@ -410,14 +571,15 @@ async def api_compute_recommendations(background_tasks: BackgroundTasks, data: d
             logging.info(f"Received {len(click_history)} items from click history")
 
         set_pending_click_history(click_history)
-        background_tasks.add_task(run_recommendation_computation)
+        # Same single worker as the FL workflow, so computations never overlap
+        submit_recommendation_computation()
 
-        return JSONResponse(
+        return ORJSONResponse(
             {
                 "status": "started",
                 "message": "Recommendation computation started in background",
                 "click_history_items": len(click_history),
-                "last_updated": datetime.now().isoformat(),
+                "last_updated": datetime.now(),
             }
         )
     except PreflightError as e:
@@ -427,42 +589,37 @@ async def api_compute_recommendations(background_tasks: BackgroundTasks, data: d
 @router.post("/watchlist")
 async def api_watchlist(data: dict):
     """Record will/won't watch action for a recommendation."""
+    action = data.get("action", "")
+    if not isinstance(action, str) or action not in _VALID_ACTIONS:
+        return ORJSONResponse({
+            "error": "Invalid action. Must be 'will_watch' or 'wont_watch'",
+            "status": "error"
+        }, status_code=400)
+
     try:
         client = get_client()
         title = data.get("title", "")
-        action = data.get("action", "")
         use_reranked = data.get("useReranked", False)
         rank = data.get("rank", None)
         page = data.get("page", 1)
         visible_items = data.get("visible_items", [])
         
-        if action not in ["will_watch", "wont_watch"]:
-            return JSONResponse({
-                "error": "Invalid action. Must be 'will_watch' or 'wont_watch'",
-                "status": "error"
-            }, status_code=400)
-        
         timestamp = datetime.now().isoformat()
         item_from_column = "Re-ranked" if use_reranked else "Unprocessed"
         
         row = [timestamp, client.email, rank, page, visible_items, item_from_column, title, action]
         
-        # NOTE: Do NOT write into the aggregator's `shared/` folder, since that is publicly readable.
-        # Instead write into our own restricted app_data folder with permissions granting the aggregator read access.
-        _, restricted_public_folder, _ = setup_environment("profile_0")
-        csv_file_path = restricted_public_folder / "interaction_logs" / "recommendations.csv"
-        _ensure_csv_has_header(
+        csv_file_path = _interaction_log_path(_RECS_CSV)
+        await asyncio.to_thread(
+            _write_interaction_row,
             csv_file_path,
-            ["timestamp", "user", "rank", "page", "visible_items", "column", "title", "action"],
+            _RECS_HEADER,
+            row,
         )
         
-        with open(csv_file_path, "a", newline='', encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(row)
-        
         logging.info(f"Watchlist action recorded: {action} for '{title}'")
         
-        return JSONResponse({
+        return ORJSONResponse({
             "status": "success",
             "message": f"Recorded '{action}' for '{title}'",
             "timestamp": timestamp
@@ -471,7 +628,7 @@ async def api_watchlist(data: dict):
         return _preflight_error_response(e)
     except Exception as e:
         logging.error(f"Error recording watchlist action: {e}")
-        return JSONResponse({
+        return ORJSONResponse({
             "error": str(e),
             "status": "error"
         }, status_code=500)
@@ -481,14 +638,8 @@ async def api_watchlist(data: dict):
 async def api_user():
     """Get current user information."""
     try:
-        client = get_client()
-        return JSONResponse(
-            {
-                "email": client.email,
-                "app_name": APP_NAME,
-                "timestamp": datetime.now().isoformat(),
-            }
-        )
+        body = _user_response_prefix() + orjson.dumps(datetime.now()) + b"}"
+        return Response(body, media_type="application/json")
     except PreflightError as e:
         return _preflight_error_response(e)
 
@@ -498,37 +649,30 @@ async def api_choice(data: dict):
     """Record user's choice from recommendations."""
     try:
         client = get_client()
-        raw_recommends, reranked_recommends = load_recommendations()
+        _, _, recommendations_by_id = load_recommendations_indexed()
         timestamp = datetime.now().isoformat()
         
         page = data.get('page', 1)
         rank = data.get("rank", None)
         visible_items = data.get('visible_items', [])
-        
-        if data.get('column') == 1:
-            column = "Unprocessed"
-            title = next((item["name"] for item in raw_recommends if item["id"] == data.get('id')), None)
-        else:
-            column = "Re-ranked"
-            title = next((item["name"] for item in reranked_recommends if item["id"] == data.get('id')), None)
+        column = "Unprocessed" if data.get('column') == 1 else "Re-ranked"
+        # Ids map to the same title in both lists, so one index serves either column.
+        title = recommendations_by_id.get(data.get('id'), {}).get("name")
 
         # Keep a consistent schema with `/watchlist` rows by filling `action`.
         row = [timestamp, client.email, rank, page, visible_items, column, title, "clicked"]
 
         # Store privately (restricted to aggregator-read) instead of publishing to aggregator shared.
-        _, restricted_public_folder, _ = setup_environment("profile_0")
-        csv_file_path = restricted_public_folder / "interaction_logs" / "recommendations.csv"
-        _ensure_csv_has_header(
+        csv_file_path = _interaction_log_path(_RECS_CSV)
+        logging.info(f"Recording choice: {title} from {column} (rank {rank}, page {page})")
+        await asyncio.to_thread(
+            _write_interaction_row,
             csv_file_path,
-            ["timestamp", "user", "rank", "page", "visible_items", "column", "title", "action"],
+            _RECS_HEADER,
+            row,
         )
 
-        logging.info(f"Recording choice: {title} from {column} (rank {rank}, page {page})")
-        with open(csv_file_path, "a", newline='', encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(row)
-
-        return JSONResponse({
+        return ORJSONResponse({
             "status": "success",
             "message": f"Received choice from {column} (ID: {data.get('id')} - {title}, page {page})"
         })
@@ -536,7 +680,7 @@ async def api_choice(data: dict):
         return _preflight_error_response(e)
     except Exception as e:
         logging.error(f"Error recording choice: {e}")
-        return JSONResponse({
+        return ORJSONResponse({
             "error": str(e),
             "status": "error"
         }, status_code=500)
@@ -549,10 +693,11 @@ async def api_feedback(data: dict):
         client = get_client()
         rating = data.get("rating", 0)
         feedback_text = data.get("feedback", "")
-        timestamp = data.get("timestamp", datetime.now().isoformat())
+        # Only build a timestamp when the client didn't send one.
+        timestamp = data["timestamp"] if "timestamp" in data else datetime.now().isoformat()
         
         if not 1 <= rating <= 5:
-            return JSONResponse({
+            return ORJSONResponse({
                 "error": "Rating must be between 1 and 5",
                 "status": "error"
             }, status_code=400)
@@ -560,23 +705,12 @@ async def api_feedback(data: dict):
         row = [timestamp, client.email, rating, feedback_text]
         
         # Store privately (restricted to aggregator-read) instead of publishing to aggregator shared.
-        _, restricted_public_folder, _ = setup_environment("profile_0")
-        csv_file_path = restricted_public_folder / "interaction_logs" / "feedback.csv"
-        
-        import os
-        if not csv_file_path.exists():
-            os.makedirs(csv_file_path.parent, exist_ok=True)
-            with open(csv_file_path, "w", newline='', encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["timestamp", "user", "rating", "feedback"])
-        
-        with open(csv_file_path, "a", newline='', encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(row)
+        csv_file_path = _interaction_log_path(_FEEDBACK_CSV)
+        await asyncio.to_thread(_write_interaction_row, csv_file_path, _FEEDBACK_HEADER, row)
         
         logging.info(f"Feedback recorded: {rating} stars from {client.email}")
         
-        return JSONResponse({
+        return ORJSONResponse({
             "status": "success",
             "message": "Thank you for your feedback!"
         })
@@ -584,7 +718,7 @@ async def api_feedback(data: dict):
         return _preflight_error_response(e)
     except Exception as e:
         logging.error(f"Error recording feedback: {e}")
-        return JSONResponse({
+        return ORJSONResponse({
             "error": str(e),
             "status": "error"
         }, status_code=500)
@@ -601,25 +735,23 @@ async def api_opt_out(data: dict):
         client = get_client()
         reason = data.get("reason", "") or ""
         user_message = data.get("user_message", "") or ""
-        timestamp = data.get("timestamp", datetime.now().isoformat())
+        # Only build a timestamp when the client didn't send one.
+        timestamp = data["timestamp"] if "timestamp" in data else datetime.now().isoformat()
 
         row = [timestamp, client.email, reason, user_message]
 
         # Store privately (restricted to aggregator-read) instead of publishing to aggregator shared.
-        _, restricted_public_folder, _ = setup_environment("profile_0")
-        csv_file_path = restricted_public_folder / "interaction_logs" / "opt_out.csv"
-        _ensure_csv_has_header(
+        csv_file_path = _interaction_log_path(_OPT_OUT_CSV)
+        await asyncio.to_thread(
+            _write_interaction_row,
             csv_file_path,
-            ["timestamp", "user", "reason", "user_message"],
+            _OPT_OUT_HEADER,
+            row,
         )
 
-        with open(csv_file_path, "a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(row)
-
         logging.info(f"Opt-out recorded for {client.email}")
 
-        return JSONResponse({
+        return ORJSONResponse({
             "status": "success",
             "message": "Opt-out recorded"
         })
@@ -627,7 +759,7 @@ async def api_opt_out(data: dict):
         return _preflight_error_response(e)
     except Exception as e:
         logging.error(f"Error recording opt-out: {e}")
-        return JSONResponse({
+        return ORJSONResponse({
             "error": str(e),
             "status": "error"
         }, status_code=500)
@@ -680,25 +812,17 @@ async def api_settings_log(data: dict):
         ]
         
         # Store privately (restricted to aggregator-read)
-        _, restricted_public_folder, _ = setup_environment("profile_0")
-        csv_file_path = restricted_public_folder / "interaction_logs" / "settings.csv"
-        _ensure_csv_has_header(
+        csv_file_path = _interaction_log_path(_SETTINGS_CSV)
+        await asyncio.to_thread(
+            _write_interaction_row,
             csv_file_path,
-            [
-                "timestamp", "user",
-                "showMoreDetails", "useReranked", "showWhyRecommended",
-                "enableWatchlist", "enableBlockItems", "showActivityCharts",
-                "showWatchlistStatus"
-            ],
+            _SETTINGS_HEADER,
+            row,
         )
         
-        with open(csv_file_path, "a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(row)
-        
         logging.info(f"Settings logged for {client.email}")
         
-        return JSONResponse({
+        return ORJSONResponse({
             "status": "success",
             "message": "Settings logged",
             "timestamp": timestamp
@@ -707,7 +831,7 @@ async def api_settings_log(data: dict):
         return _preflight_error_response(e)
     except Exception as e:
         logging.error(f"Error logging settings: {e}")
-        return JSONResponse({
+        return ORJSONResponse({
             "error": str(e),
             "status": "error"
         }, status_code=500)
@@ -721,11 +845,11 @@ async def api_fl_status():
     try:
         status = get_fl_status()
         needs_training = check_fine_tuning_needed()
-        return JSONResponse(
+        return ORJSONResponse(
             {
                 **status,
                 "needs_fine_tuning": needs_training,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": datetime.now(),
             }
         )
     except PreflightError as e:
@@ -746,27 +870,27 @@ async def api_global_v_info():
         path: File path (for debugging)
     """
     try:
-        profile = "profile_0"
-        restricted_shared_folder, _, _ = setup_environment(profile)
-        global_v_path = restricted_shared_folder / "global_V.npy"
-    
-        if global_v_path.exists():
-            mtime = global_v_path.stat().st_mtime
-            return JSONResponse(
+        global_v_path = _global_v_path("profile_0")
+
+        # A single stat() answers both "exists?" and "when was it modified?"
+        try:
+            mtime = os.stat(global_v_path).st_mtime
+        except FileNotFoundError:
+            return ORJSONResponse(
                 {
-                    "exists": True,
-                    "last_modified": datetime.fromtimestamp(mtime).isoformat(),
-                    "path": str(global_v_path),
-                    "timestamp": datetime.now().isoformat(),
+                    "exists": False,
+                    "last_modified": None,
+                    "path": global_v_path,
+                    "timestamp": datetime.now(),
                 }
             )
 
-        return JSONResponse(
+        return ORJSONResponse(
             {
-                "exists": False,
-                "last_modified": None,
-                "path": str(global_v_path),
-                "timestamp": datetime.now().isoformat(),
+                "exists": True,
+                "last_modified": _mtime_to_datetime(mtime),
+                "path": global_v_path,
+                "timestamp": datetime.now(),
             }
         )
     except PreflightError as e:
@@ -779,7 +903,7 @@ async def api_fine_tune(background_tasks: BackgroundTasks, data: dict = None):
     status = get_fl_status()
     
     if status["status"] in ["fine_tuning", "running"]:
-        return JSONResponse({
+        return ORJSONResponse({
             "status": "already_running",
             "message": "Fine-tuning or FL workflow is already in progress",
             "last_updated": status["last_updated"]
@@ -793,12 +917,12 @@ async def api_fine_tune(background_tasks: BackgroundTasks, data: dict = None):
     
     background_tasks.add_task(run_fine_tuning, profile, epsilon)
     
-    return JSONResponse({
+    return ORJSONResponse({
         "status": "started",
         "message": "Fine-tuning started in background",
         "profile": profile,
         "epsilon": epsilon,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now()
     })
 
 
@@ -828,16 +952,16 @@ async def api_run_fl_workflow(background_tasks: BackgroundTasks, data: dict = No
     # Pre-check: Verify viewing history exists before starting workflow
     data_status = check_viewing_history_exists(profile)
     if not data_status["exists"]:
-        return JSONResponse({
+        return ORJSONResponse({
             "status": "no_viewing_history",
             "message": "No viewing history found. Please upload your Netflix viewing history first.",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }, status_code=400)
     
     status = get_fl_status()
     
     if status["status"] in ["fine_tuning", "running"]:
-        return JSONResponse({
+        return ORJSONResponse({
             "status": "already_running",
             "message": "FL workflow is already in progress",
             "last_updated": status["last_updated"]
@@ -847,11 +971,11 @@ async def api_run_fl_workflow(background_tasks: BackgroundTasks, data: dict = No
     
     background_tasks.add_task(run_full_fl_workflow, profile, epsilon, click_history)
     
-    return JSONResponse({
+    return ORJSONResponse({
         "status": "started",
         "message": f"Full FL workflow started in background with {click_count} click history items",
         "profile": profile,
         "epsilon": epsilon,
         "click_history_count": click_count,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now()
     })
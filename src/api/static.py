@@ -0,0 +1,116 @@
+"""Static UI file serving with HTTP caching headers."""
+
+import hashlib
+import mimetypes
+import os
+from pathlib import Path
+from urllib.parse import parse_qs
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import Response
+
+# Versioned URLs (e.g. `app.js?v=3`) never change content, so browsers may keep
+# them forever. Everything else, and HTML always, must be revalidated, which
+# costs a 304 and no body. Only the explicit version parameter counts: the
+# files aren't content-hashed, so any other query string says nothing.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+VERSION_QUERY_PARAM = "v"
+
+# Files larger than this are not kept in memory; they are streamed from disk by
+# Starlette's FileResponse (zero-copy where the ASGI server supports pathsend).
+MAX_PRELOAD_BYTES = 1 << 20
+
+
+def weak_etag(stat_result: os.stat_result) -> str:
+    """Build a weak ETag from a file's modification time and size."""
+    return f'W/"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+
+def preload_directory(
+    directory: Path, max_bytes: int = MAX_PRELOAD_BYTES
+) -> dict[str, tuple[bytes, str, str]]:
+    """
+    Read every file under `directory` (up to `max_bytes` each) into memory.
+
+    Returns:
+        dict: {relative posix path: (content, content_type, etag)}
+    """
+    files = {}
+    for file_path in Path(directory).rglob("*"):
+        if not file_path.is_file() or file_path.stat().st_size > max_bytes:
+            continue
+        with open(file_path, "rb") as f:
+            content = f.read()
+        content_type = mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type.endswith("javascript"):
+            content_type += "; charset=utf-8"
+        etag = f'"{hashlib.blake2b(content, digest_size=8).hexdigest()}"'
+        files[file_path.relative_to(directory).as_posix()] = (content, content_type, etag)
+    return files
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles that sends Cache-Control + ETag headers.
+
+    The UI bundle is small and never changes while the server runs, so it is
+    read into memory once at startup and served without touching the disk
+    (larger files fall back to StaticFiles' FileResponse). Repeat loads are
+    answered with `304 Not Modified` when the browser's `If-None-Match`
+    matches, so no file body is re-transferred.
+    """
+
+    def __init__(self, *, directory, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        self._files = preload_directory(Path(directory))
+
+    def _lookup(self, path: str):
+        key = "" if path in ("", ".") else path.replace(os.sep, "/").strip("/")
+        entry = self._files.get(key)
+        if entry is None and self.html:
+            entry = self._files.get(f"{key}/index.html" if key else "index.html")
+        return entry
+
+    @staticmethod
+    def _cache_headers(scope, etag: str, content_type: str) -> dict[str, str]:
+        versioned = VERSION_QUERY_PARAM in parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        if versioned and not content_type.startswith("text/html"):
+            cache_control = IMMUTABLE_CACHE_CONTROL
+        else:
+            cache_control = REVALIDATE_CACHE_CONTROL
+        return {"ETag": etag, "Cache-Control": cache_control}
+
+    @staticmethod
+    def _is_not_modified(scope, etag: str) -> bool:
+        """`If-None-Match` check: `*` or any listed tag, compared weakly (RFC 9110)."""
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        opaque = etag.removeprefix("W/")
+        return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+    async def get_response(self, path: str, scope) -> Response:
+        entry = self._lookup(path)
+        if entry is None or scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+
+        content, content_type, etag = entry
+        headers = self._cache_headers(scope, etag, content_type)
+        if self._is_not_modified(scope, etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=content, media_type=content_type, headers=headers)
+
+    def file_response(self, full_path, stat_result, scope, status_code=200) -> Response:
+        etag = weak_etag(stat_result)
+        content_type = mimetypes.guess_type(os.fspath(full_path))[0] or ""
+        headers = self._cache_headers(scope, etag, content_type)
+        if self._is_not_modified(scope, etag):
+            return Response(status_code=304, headers=headers)
+
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers.update(headers)
+        return response
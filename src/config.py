@@ -12,6 +12,10 @@ load_dotenv(env_path)
 APP_NAME = os.getenv("APP_NAME", "federated-recommendations")
 AGGREGATOR_DATASITE = os.getenv("AGGREGATOR_DATASITE")
 
+# Build the extra Syft RPC OpenAPI schema at startup (served at /syft/openapi.json).
+# Off by default: no API route is exposed over Syft RPC, so the schema is empty.
+INCLUDE_SYFT_OPENAPI = os.getenv("INCLUDE_SYFT_OPENAPI", "false").lower() in ("1", "true", "yes")
+
 # Runtime item-factor normalization (scales item embeddings before scoring)
 # Default: enabled to defensively bound dot-product magnitudes that can arise
 # from large global item factors. Override via env var `NORMALIZE_ITEM_FACTORS=false`.
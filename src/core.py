@@ -11,7 +11,10 @@ from src.config import APP_NAME, AGGREGATOR_DATASITE
 from src.preflight import PreflightError, require_preflight
 
 
-@lru_cache(maxsize=1)
+# The SyftBox client, created on first use by `get_client()`.
+_client = None
+
+
 def get_client() -> SyftboxClient:
     """
     Lazily initialize the SyftBox client.
@@ -19,42 +22,61 @@ def get_client() -> SyftboxClient:
     This avoids crashing at import time, and ensures we can provide friendly,
     actionable diagnostics when SyftBox isn't configured correctly.
     """
-    require_preflight()
+    global _client
 
-    from syft_core import SyftClientConfig  # local import for cleaner failures
+    if _client is not None:
+        return _client
 
-    config = SyftClientConfig.load()
-    return SyftboxClient(config)
+    preflight = require_preflight()
 
+    config = preflight.config
+    if config is None:
+        from syft_core import SyftClientConfig  # local import for cleaner failures
 
+        config = SyftClientConfig.load()
+    _client = SyftboxClient(config)
+    return _client
+
+
+@lru_cache(maxsize=None)
 def get_private_path(profile: str = "profile_0"):
-    """Get the participant's private data path."""
+    """Get the participant's private data path (resolved once per profile)."""
     client = get_client()
     return Path(client.config.data_dir) / "private" / APP_NAME / profile
 
 
+@lru_cache(maxsize=1)
+def _datasites_path() -> Path:
+    """Parent folder of all datasites (resolved once)."""
+    return Path(get_client().datasite_path.parent)
+
+
+@lru_cache(maxsize=1)
 def get_shared_folder_path():
-    """Get the shared folder path from the aggregator."""
+    """Get the shared folder path from the aggregator (resolved once)."""
     if not AGGREGATOR_DATASITE:
         raise PreflightError(
             "Missing `AGGREGATOR_DATASITE`.\n\n"
             "Fix:\n"
             "- Set `AGGREGATOR_DATASITE` in `.env` to the aggregator's datasite email.\n"
         )
-    client = get_client()
-    datasites_path = Path(client.datasite_path.parent)
-    return datasites_path / AGGREGATOR_DATASITE / "app_data" / APP_NAME / "shared"
+    return _datasites_path() / AGGREGATOR_DATASITE / "app_data" / APP_NAME / "shared"
 
 
+@lru_cache(maxsize=None)
 def get_restricted_public_folder(profile: str = "profile_0"):
-    """Get the restricted public folder path (aggregator can read delta_V from here)."""
+    """Get the restricted public folder path (aggregator can read delta_V from here; resolved once per profile)."""
     client = get_client()
     return client.app_data(APP_NAME) / profile
 
 
+@lru_cache(maxsize=16)
 def setup_environment(profile: str = "profile_0"):
     """
     Set up the participant environment with proper folder structure and permissions.
+
+    The result is cached per profile, so folders and permissions are only set
+    up on the first call (failures are not cached and are retried).
     
     Creates:
     - Private folder: for user data (ratings, U matrix, viewing history)
@@ -97,5 +119,4 @@ def setup_environment(profile: str = "profile_0"):
 
 def get_datasites_path():
     """Get the datasites path."""
-    client = get_client()
-    return Path(client.datasite_path.parent)
+    return _datasites_path()
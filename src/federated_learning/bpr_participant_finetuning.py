@@ -1,6 +1,5 @@
 """BPR participant fine-tuning for federated learning."""
 
-import copy
 import logging
 import os
 import random
@@ -8,16 +7,20 @@ import random
 import numpy as np
 
 from src.services.data_loading import (
+    USER_MATRIX_DTYPE,
     load_global_item_factors,
     load_or_initialize_user_matrix,
     load_participant_ratings,
     load_tv_vocabulary,
 )
 from src.federated_learning.bpr_dp import (
+    DELTA_DTYPE,
+    DeltaBatch,
     apply_differential_privacy,
     plot_ratings_norm,
+    row_norms,
 )
-from src.federated_learning.sequence_data import match_title
+from src.federated_learning.sequence_data import match_titles
 
 
 def save_training_results(user_id, private_path, restricted_path, V, delta_V, U_u):
@@ -47,7 +50,7 @@ def save_training_results(user_id, private_path, restricted_path, V, delta_V, U_
 
     # Save updated user matrix (private)
     user_matrix_path = os.path.join(user_private_path, "U.npy")
-    np.save(user_matrix_path, U_u)
+    np.save(user_matrix_path, U_u.astype(USER_MATRIX_DTYPE, copy=False), allow_pickle=False)
 
     logging.info(f"Saved private training results for user: {user_id} at {user_private_path}.")
     logging.info(f"Saved delta updates for user: {user_id} at {user_restricted_path}.")
@@ -59,12 +62,13 @@ def prepare_training_data(user_id, tv_vocab, final_ratings):
     Uses fuzzy matching to map Netflix titles to vocabulary indices,
     consistent with how create_view_counts_vector works.
     """
-    item_ids = {}
-    for title in final_ratings:
-        # Use fuzzy matching (same as sequence_data.create_view_counts_vector)
-        matched_idx = match_title(title, tv_vocab, threshold=80)
-        if matched_idx != -1:
-            item_ids[title] = matched_idx
+    # Use fuzzy matching (same as sequence_data.create_view_counts_vector)
+    titles = list(final_ratings)
+    item_ids = {
+        title: matched_idx
+        for title, matched_idx in zip(titles, match_titles(titles, tv_vocab, threshold=80))
+        if matched_idx != -1
+    }
     
     return [
         (user_id, item_ids[t], final_ratings[t]) for t in final_ratings if t in item_ids
@@ -88,8 +92,9 @@ def perform_local_training(
     Returns:
         tuple: (initial_V, updated_V, updated_U_u)
     """
-    V = copy.deepcopy(initial_V)
-    U_u = copy.deepcopy(initial_U_u)
+    # Plain array copies; deepcopy's generic object walk isn't needed for ndarrays.
+    V = np.array(initial_V, copy=True)
+    U_u = np.array(initial_U_u, copy=True)
 
     # Hyperparameters from FedBPR paper
     user_reg = alpha / 20
@@ -196,26 +201,22 @@ def participant_fine_tuning(
     # Step 6: Perform local training
     initial_V, updated_V, updated_U_u = perform_local_training(train_data, V, U_u)
 
-    # Step 7: Compute deltas
+    # Step 7: Compute deltas (one row per updated item)
     if dp_all:
-        delta_V = {
-            item_id: updated_V[item_id] - initial_V[item_id]
-            for item_id, _ in enumerate(initial_V)
-        }
+        item_ids = np.arange(len(initial_V))
     else:
-        delta_V = {
-            item_id: updated_V[item_id] - initial_V[item_id]
-            for (_, item_id, _) in train_data
-        }
+        item_ids = np.fromiter(dict.fromkeys(item_id for (_, item_id, _) in train_data), dtype=np.int64)
+    delta_V = DeltaBatch(item_ids, (updated_V[item_ids] - initial_V[item_ids]).astype(DELTA_DTYPE))
 
-    delta_norms_before = [np.linalg.norm(v) for v in delta_V.values()]
+    delta_norms_before = row_norms(delta_V.M)
 
     # Step 8: Apply differential privacy
-    dp_deltas = apply_differential_privacy(
+    dp_batch = apply_differential_privacy(
         delta_V, epsilon, 0.36, noise_type=noise_type
     )
+    dp_deltas = dp_batch.to_dict()
 
-    delta_norms_after = [np.linalg.norm(v) for v in dp_deltas.values()]
+    delta_norms_after = row_norms(dp_batch.M)
 
     # Step 9: Save results
     save_training_results(
@@ -224,7 +225,7 @@ def participant_fine_tuning(
 
     # Step 10: Optional plotting
     if plot:
-        sorted_item_ids = sorted(delta_V.keys())
+        sorted_item_ids = sorted(dp_deltas.keys())
         plot_ratings_norm(
             user_id, sorted_item_ids, delta_norms_before, delta_norms_after
         )
@@ -1,8 +1,7 @@
 """BPR local recommendation computation."""
 
-import copy
+from functools import lru_cache
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 import logging
 
@@ -14,15 +13,53 @@ def normalize_string(s):
     return s.replace("\u200b", "").lower()
 
 
+@lru_cache(maxsize=1)
+def _get_sbert():
+    """Load the title embedding model once per process."""
+    return SentenceTransformer("all-MiniLM-L6-v2")
+
+
+def _mmr_select(embeddings, relevance, lambda_param, n_select):
+    """
+    Greedy MMR selection over unit-length `embeddings`; returns the picked indices.
+
+    All buffers are allocated once up front, so each step is a few in-place
+    array operations plus one matrix-vector product.
+    """
+    relevance = lambda_param * np.asarray(relevance, dtype=np.float64)
+    penalty_weight = 1 - lambda_param
+    # Highest similarity of each item to anything selected so far, kept up to date
+    # as items are picked instead of recomputed against the whole selection.
+    max_similarity = np.full(len(relevance), -np.inf, dtype=np.float32)
+    similarity = np.empty(len(relevance), dtype=np.float32)
+    mmr_scores = relevance.copy()
+
+    selected_indices = []
+    while len(selected_indices) < n_select:
+        if selected_indices:
+            np.multiply(max_similarity, penalty_weight, out=mmr_scores)
+            np.subtract(relevance, mmr_scores, out=mmr_scores)
+            mmr_scores[selected_indices] = -np.inf
+
+        selected_idx = int(np.argmax(mmr_scores))
+        selected_indices.append(selected_idx)
+        np.dot(embeddings, embeddings[selected_idx], out=similarity)
+        np.maximum(max_similarity, similarity, out=max_similarity)
+
+    return selected_indices
+
+
 def mmr_rerank_predictions(unprocessed_predictions, lambda_param=0.3, top_n=50, normalize_scores=True):
     """Maximal Marginal Relevance reranking for diversity.
 
     normalize_scores: whether to min-max normalize the ratings before computing MMR.
     If False, the ratings are used as provided (useful if recommendations are already normalized).
     """
-    model = SentenceTransformer("all-MiniLM-L6-v2")
+    model = _get_sbert()
     titles = [title for title, _, _ in unprocessed_predictions]
-    embeddings = model.encode(titles, convert_to_tensor=False, show_progress_bar=False)
+    embeddings = model.encode(
+        titles, convert_to_numpy=True, normalize_embeddings=True, batch_size=64, show_progress_bar=False
+    )
 
     ratings = np.array([pred_rating for _, _, pred_rating in unprocessed_predictions])
     if normalize_scores:
@@ -35,34 +72,96 @@ def mmr_rerank_predictions(unprocessed_predictions, lambda_param=0.3, top_n=50,
     else:
         ratings_normalized = ratings.copy()
 
-    selected_indices = []
-    candidate_indices = list(range(len(unprocessed_predictions)))
+    # Unit-length rows, so cosine similarity is a plain dot product
+    # (zero embeddings stay zero and are similar to nothing).
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    emb_norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    embeddings = np.divide(embeddings, emb_norms, out=np.zeros_like(embeddings), where=emb_norms > 0)
 
-    while len(selected_indices) < min(top_n, len(unprocessed_predictions)):
-        mmr_scores = []
-        for idx in candidate_indices:
-            relevance = ratings_normalized[idx]
+    selected_indices = _mmr_select(
+        embeddings, ratings_normalized, lambda_param, min(top_n, len(unprocessed_predictions))
+    )
+    return [unprocessed_predictions[i] for i in selected_indices]
 
-            if not selected_indices:
-                diversity_penalty = 0
-            else:
-                similarities = cosine_similarity(
-                    embeddings[idx].reshape(1, -1),
-                    embeddings[selected_indices]
-                )[0]
-                diversity_penalty = max(similarities)
 
-            mmr_score = lambda_param * relevance - (1 - lambda_param) * diversity_penalty
-            mmr_scores.append((idx, mmr_score))
+def to_activity_columns(user_aggregated_activity):
+    """Return user activity as typed columns {title, week, n_watched, rating}.
 
-        selected_idx = max(mmr_scores, key=lambda x: x[1])[0]
-        selected_indices.append(selected_idx)
-        candidate_indices.remove(selected_idx)
+    Accepts either such a column dict (returned as-is) or an iterable of
+    (title, week, n_watched, rating) rows, e.g. the object array saved in
+    netflix_aggregated.npy.
+    """
+    if isinstance(user_aggregated_activity, dict):
+        return user_aggregated_activity
+    rows = list(user_aggregated_activity)
+    return {
+        "title": np.array([row[0] for row in rows], dtype=object),
+        "week": np.array([int(row[1]) for row in rows], dtype=np.int32),
+        "n_watched": np.array([int(row[2]) for row in rows], dtype=np.int32),
+        "rating": np.array([float(row[3]) for row in rows], dtype=np.float32),
+    }
 
-    return [unprocessed_predictions[i] for i in selected_indices]
 
+def _row_norms(matrix):
+    """L2 norm of each row, in one einsum pass."""
+    return np.sqrt(np.einsum("ij,ij->i", matrix, matrix))
 
-import logging
+
+# Vocabulary as arrays, reused while the same vocab dict is passed in:
+# (tv_vocab, (titles, item_ids, normalized_titles))
+_vocab_arrays_cache = None
+
+
+def _vocab_arrays(tv_vocab):
+    """Return the vocabulary's titles, item ids and normalized titles, in vocab order."""
+    global _vocab_arrays_cache
+
+    cache = _vocab_arrays_cache
+    if cache is not None and cache[0] is tv_vocab and len(cache[1][2]) == len(tv_vocab):
+        return cache[1]
+
+    titles = np.array(list(tv_vocab.keys()), dtype=object)
+    item_ids = np.fromiter(tv_vocab.values(), dtype=np.int64, count=len(tv_vocab))
+    normalized_titles = [normalize_string(title) for title in titles]
+    arrays = (titles, item_ids, normalized_titles)
+    _vocab_arrays_cache = (tv_vocab, arrays)
+    return arrays
+
+
+def _item_factors_for_scoring(
+    global_V, normalize_item_factors=None, item_factor_norm_method=None, item_factor_norm_target=None
+):
+    """Return the item factors to score with, normalized/scaled as configured."""
+    if normalize_item_factors is None:
+        normalize_item_factors = NORMALIZE_ITEM_FACTORS
+    if normalize_item_factors:
+        method = item_factor_norm_method or ITEM_FACTOR_NORM_METHOD
+        target = item_factor_norm_target or ITEM_FACTOR_NORM_TARGET
+        try:
+            # Copy to normalize in place; half-precision factors are widened to float32
+            V_for_scoring = global_V.astype(np.promote_types(global_V.dtype, np.float32))
+            norms = _row_norms(V_for_scoring)
+            mean_norm = float(np.mean(norms))
+            max_norm = float(np.max(norms))
+            logging.info(f"Item factor norms before normalization: mean={mean_norm:.4f}, max={max_norm:.4f}")
+            if method == "l2":
+                V_for_scoring /= np.where(norms > 0, norms, 1.0)[:, None]
+            elif method == "scale_mean":
+                if mean_norm > 0:
+                    scale = float(target) / mean_norm
+                    V_for_scoring = V_for_scoring * scale
+            else:
+                logging.warning(f"Unknown ITEM_FACTOR_NORM_METHOD: {method}. Skipping normalization.")
+                V_for_scoring = global_V
+            # Log post-normalization mean norm
+            post_norms = _row_norms(V_for_scoring)
+            logging.info(f"Item factor norms after normalization: mean={float(np.mean(post_norms)):.4f}, max={float(np.max(post_norms)):.4f}")
+        except Exception as e:
+            logging.error(f"Failed to normalize item factors: {e}")
+            V_for_scoring = global_V
+    else:
+        V_for_scoring = global_V
+    return V_for_scoring
 
 
 def compute_recommendations(
@@ -91,83 +190,58 @@ def compute_recommendations(
 
     item_factor_norm_method: if normalization enabled, one of 'l2' (unit L2 rows) or 'scale_mean' (scale to target mean norm)
     item_factor_norm_target: used by 'scale_mean' to set the target mean norm (float)
+
+    user_aggregated_activity: (title, week, n_watched, rating) rows, or the
+        equivalent typed columns (see `to_activity_columns`).
     """
     logging.debug("Selecting recommendations based on most recent shows watched...")
 
-    recent_items = [
-        title
-        for (title, week, n_watched, rating) in user_aggregated_activity
-        if int(week) == recent_week
-    ]
+    activity = to_activity_columns(user_aggregated_activity)
+    recent_items = activity["title"][activity["week"] == recent_week].tolist()
     recent_item_ids = [tv_vocab[title] for title in recent_items if title in tv_vocab]
     logging.info(f"For week (of all years) {recent_week}, watched n_shows=: {len(recent_items)}")
 
     U_recent = user_U
 
-    all_items = list(tv_vocab.keys())
-    watched_titles = set(
-        normalize_string(t) for (t, _, _, _) in user_aggregated_activity
-    )
+    all_titles, all_item_ids, normalized_titles = _vocab_arrays(tv_vocab)
     if exclude_watched:
-        candidate_items = [
-            title
-            for title in all_items
-            if normalize_string(title) not in watched_titles
-        ]
+        # Normalize each distinct watched title once; vocab titles come pre-normalized.
+        watched_titles = frozenset(map(normalize_string, set(activity["title"].tolist())))
+        # Set lookups beat np.isin here: it would sort and compare Python strings.
+        candidate_mask = np.fromiter(
+            (title not in watched_titles for title in normalized_titles), dtype=bool, count=len(normalized_titles)
+        )
+        candidate_items = all_titles[candidate_mask].tolist()
+        candidate_ids = all_item_ids[candidate_mask]
     else:
-        candidate_items = all_items
+        candidate_items = all_titles.tolist()
+        candidate_ids = all_item_ids
 
     # Optionally normalize/scale global item factors before scoring
-    if normalize_item_factors is None:
-        normalize_item_factors = NORMALIZE_ITEM_FACTORS
-    if normalize_item_factors:
-        method = item_factor_norm_method or ITEM_FACTOR_NORM_METHOD
-        target = item_factor_norm_target or ITEM_FACTOR_NORM_TARGET
-        try:
-            norms = np.linalg.norm(global_V, axis=1)
-            mean_norm = float(np.mean(norms))
-            max_norm = float(np.max(norms))
-            logging.info(f"Item factor norms before normalization: mean={mean_norm:.4f}, max={max_norm:.4f}")
-            V_for_scoring = global_V.copy()
-            if method == "l2":
-                nonzero = norms > 0
-                V_for_scoring[nonzero] = V_for_scoring[nonzero] / norms[nonzero][:, None]
-            elif method == "scale_mean":
-                if mean_norm > 0:
-                    scale = float(target) / mean_norm
-                    V_for_scoring = V_for_scoring * scale
-            else:
-                logging.warning(f"Unknown ITEM_FACTOR_NORM_METHOD: {method}. Skipping normalization.")
-                V_for_scoring = global_V
-            # Log post-normalization mean norm
-            post_norms = np.linalg.norm(V_for_scoring, axis=1)
-            logging.info(f"Item factor norms after normalization: mean={float(np.mean(post_norms)):.4f}, max={float(np.max(post_norms)):.4f}")
-        except Exception as e:
-            logging.error(f"Failed to normalize item factors: {e}")
-            V_for_scoring = global_V
-    else:
-        V_for_scoring = global_V
+    V_for_scoring = _item_factors_for_scoring(
+        global_V, normalize_item_factors, item_factor_norm_method, item_factor_norm_target
+    )
 
-    predictions = []
-    for title in candidate_items:
-        item_id = tv_vocab[title]
-        pred_rating = U_recent.dot(V_for_scoring[item_id])
-        predictions.append((title, item_id, pred_rating))
+    # Score every candidate with one single-precision matrix-vector product.
+    candidate_V = np.asarray(V_for_scoring)[candidate_ids].astype(np.float32, copy=False)
+    scores = candidate_V @ np.asarray(U_recent, dtype=np.float32)
+    predictions = list(zip(candidate_items, candidate_ids.tolist(), scores.tolist()))
 
     # Diagnostic: log raw score stats before any normalization
     try:
         import numpy as _np
-        raw_scores = _np.array([s for _, _, s in predictions], dtype=float)
+        raw_scores = scores.astype(float, copy=False)
         if raw_scores.size:
             logging.debug(f"Raw score stats: min={raw_scores.min():.6f}, max={raw_scores.max():.6f}, mean={raw_scores.mean():.6f}")
             # Warn if raw scores exceed 1 (unexpected for this dataset)
             if raw_scores.max() > 1.0:
-                # Show top samples for inspection
-                sorted_idx = _np.argsort(raw_scores)[::-1]
-                sample_idx = sorted_idx[:10]
+                # Show top samples for inspection (partial selection, no full sort)
+                n_samples = min(10, raw_scores.size)
+                top_idx = _np.argpartition(raw_scores, -n_samples)[-n_samples:]
+                sample_idx = top_idx[_np.argsort(raw_scores[top_idx])[::-1]]
                 sample_pairs = [(predictions[i][0], float(raw_scores[i])) for i in sample_idx]
                 logging.warning(
-                    f"Unexpected raw score magnitudes (max > 1). Top samples: {sample_pairs}. U_norm={_np.linalg.norm(user_U):.4f}, V_mean_norm={_np.mean([_np.linalg.norm(global_V[tv_vocab[k]]) for k in list(tv_vocab.keys())]):.4f}"
+                    f"Unexpected raw score magnitudes (max > 1). Top samples: {sample_pairs}. U_norm={_np.linalg.norm(user_U):.4f}, V_mean_norm={_np.mean(_row_norms(global_V)[all_item_ids]):.4f}"
                 )
         else:
             logging.debug("Raw scores empty")
@@ -175,32 +249,23 @@ def compute_recommendations(
         logging.debug("Could not compute raw score stats")
 
     # Optional per-user score normalization for interpretability (None | 'sigmoid' | 'minmax')
+    scores = scores.astype(float, copy=False)
     if score_normalization == "sigmoid":
-        import numpy as _np
-        predictions = [
-            (t, i, float(1 / (1 + _np.exp(-s)))) for (t, i, s) in predictions
-        ]
+        scores = 1 / (1 + np.exp(-scores))
     elif score_normalization == "minmax":
-        import numpy as _np
-        scores = _np.array([s for _, _, s in predictions], dtype=float)
-        if scores.size == 0:
-            normalized_scores = scores
-        else:
+        if scores.size:
             min_s = float(scores.min())
             max_s = float(scores.max())
             if max_s - min_s == 0:
-                normalized_scores = _np.zeros_like(scores)
+                scores = np.zeros_like(scores)
             else:
-                normalized_scores = (scores - min_s) / (max_s - min_s)
-        predictions = [
-            (title, item_id, float(normalized_scores[idx]))
-            for idx, (title, item_id, _) in enumerate(predictions)
-        ]
+                scores = (scores - min_s) / (max_s - min_s)
+    if score_normalization in ("sigmoid", "minmax"):
+        predictions = list(zip(candidate_items, candidate_ids.tolist(), scores.tolist()))
 
     # Diagnostic: log post-normalization stats and warn if values outside [0,1]
     try:
-        import numpy as _np
-        post_scores = _np.array([s for _, _, s in predictions], dtype=float)
+        post_scores = scores
         if post_scores.size:
             logging.debug(f"Post-norm score stats ({score_normalization}): min={post_scores.min():.6f}, max={post_scores.max():.6f}, mean={post_scores.mean():.6f}")
             if score_normalization in ("sigmoid", "minmax"):
@@ -211,12 +276,18 @@ def compute_recommendations(
     except Exception:
         logging.debug("Could not compute post-normalization stats")
 
-    predictions.sort(key=lambda x: x[2], reverse=True)
+    # Only the top 50 are returned: partition them out, then sort just those
+    # (ties keep candidate order, as the previous stable sort did).
+    top_k = min(50, scores.size)
+    top = np.argpartition(-scores, top_k - 1)[:top_k] if top_k < scores.size else np.arange(scores.size)
+    top = top[np.lexsort((top, -scores[top]))]
+    raw_predictions = [predictions[i] for i in top]
 
-    raw_predictions = copy.deepcopy(predictions)
+    # MMR considers every candidate; its picks don't depend on input order.
     # If we already normalized scores above, tell MMR not to re-normalize
     reranked_predictions = mmr_rerank_predictions(
         predictions, 0.3, 50, normalize_scores=(score_normalization is None)
     )
 
-    return raw_predictions[:50], reranked_predictions[:50]
+    return raw_predictions, reranked_predictions[:50]
+
@@ -1,14 +1,13 @@
 """Sequence data processing for Netflix viewing history."""
 
-import json
 import logging
 import os
-import re
-from datetime import datetime
 
 import numpy as np
 import pandas as pd
-from rapidfuzz import process
+from rapidfuzz import fuzz, process
+
+from src.services.data_loading import load_tv_vocabulary
 
 class SequenceData:
     """Process Netflix viewing data into sequential format."""
@@ -17,23 +16,25 @@ class SequenceData:
         self.dataset = dataset
         self.aggregated_data = self.process_dataset()
 
-    def parse_date_str(self, date_str):
-        formats = ["%d/%m/%Y", "%m/%d/%y"]
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str, fmt)
-            except ValueError:
-                continue
-        return pd.NaT
+    # Netflix exports dates as day/month/year or month/day/2-digit-year, depending on locale.
+    DATE_FORMATS = ("%d/%m/%Y", "%m/%d/%y")
+
+    def parse_dates(self, dates: pd.Series) -> pd.Series:
+        """Parse dates with the first matching format (vectorized), otherwise NaT."""
+        parsed = pd.to_datetime(dates, format=self.DATE_FORMATS[0], errors="coerce")
+        for fmt in self.DATE_FORMATS[1:]:
+            # Only the dates no earlier format could read go through the next parser.
+            missing = parsed.isna()
+            if not missing.any():
+                break
+            parsed = parsed.fillna(pd.to_datetime(dates[missing], format=fmt, errors="coerce"))
+        return parsed
 
     def extract_features(self, df):
-        df["show"] = df["Title"].apply(lambda x: x.split(":")[0] if ":" in x else x)
-        df["season"] = df["Title"].apply(
-            lambda x: int(re.search(r"Season (\d+)", x).group(1))
-            if re.search(r"Season (\d+)", x)
-            else 0
-        )
-        df["Date"] = df["Date"].apply(self.parse_date_str)
+        titles = df["Title"].astype(str)
+        df["show"] = titles.str.split(":", n=1).str[0]
+        df["season"] = titles.str.extract(r"Season (\d+)", expand=False).fillna(0).astype(int)
+        df["Date"] = self.parse_dates(df["Date"])
         df["day_of_week"] = df["Date"].dt.dayofweek
         return df
 
@@ -53,39 +54,75 @@ class SequenceData:
         df_filtered = df_aggregated[df_aggregated["Total_Views"] > 1].reset_index(drop=True)
         return df_filtered
 
+    def to_numpy_columns(self):
+        """Return the aggregated (shows, first_seen, total_views) as arrays."""
+        df = self.aggregated_data
+        return (
+            df["show"].to_numpy(dtype=object),
+            df["First_Seen"].to_numpy(dtype="datetime64[ns]"),
+            df["Total_Views"].to_numpy(),
+        )
+
+
+def lowercase_index(vocabulary: dict) -> dict:
+    """Map lowercased vocabulary titles to ids (first title wins on collisions)."""
+    index = {}
+    for key, item_id in vocabulary.items():
+        index.setdefault(key.lower(), item_id)
+    return index
+
 
-def match_title(title, vocabulary: dict, threshold=80):
-    """Match title to vocabulary using exact or fuzzy matching."""
+def _exact_match(title, vocabulary: dict, vocab_lower: dict):
+    """Exact, then case-insensitive lookup; -1 when neither hits."""
     if title in vocabulary:
         return vocabulary[title]
+    if isinstance(title, str):
+        return vocab_lower.get(title.lower(), -1)
+    return -1
 
-    vocab_keys = list(vocabulary.keys())
-    match_result = process.extractOne(title, vocab_keys)
 
-    if match_result is not None:
-        best_match, score = match_result[:2]
-        if score >= threshold:
-            return vocabulary[best_match]
+def match_titles(titles, vocabulary: dict, threshold=80):
+    """
+    Match titles to vocabulary ids using exact, case-insensitive or fuzzy matching.
 
-    return -1
+    Exact and case-insensitive matches are plain dict lookups. The rest are
+    scored against the whole vocabulary in a single `process.cdist` call (the
+    scorer `extractOne` uses by default), instead of one `extractOne` scan per
+    title. Titles with no match at or above `threshold` get -1.
+    """
+    vocab_lower = lowercase_index(vocabulary)
+    ids = [_exact_match(title, vocabulary, vocab_lower) for title in titles]
+    pending = [i for i, item_id in enumerate(ids) if item_id == -1]
+    if not pending or not vocabulary:
+        return ids
+
+    vocab_keys = list(vocabulary.keys())
+    scores = process.cdist(
+        [titles[i] for i in pending], vocab_keys, scorer=fuzz.WRatio, dtype=np.float64, workers=-1
+    )
+    best = scores.argmax(axis=1)
+    best_scores = scores[np.arange(len(pending)), best]
+    for i, best_idx, score in zip(pending, best.tolist(), best_scores.tolist()):
+        if score >= threshold:
+            ids[i] = vocabulary[vocab_keys[best_idx]]
+    return ids
 
 
 def create_view_counts_vector(restricted_shared_folder, aggregated_data: pd.DataFrame) -> np.ndarray:
     """Create sparse vector of view counts."""
-    shared_file = os.path.join(restricted_shared_folder, "vocabulary.json")
-    with open(shared_file, "r", encoding="utf-8") as file:
-        vocabulary = json.load(file)
+    vocabulary = load_tv_vocabulary(os.path.join(restricted_shared_folder, "vocabulary.json"))
 
-    aggregated_data["ID"] = aggregated_data["show"].apply(lambda x: match_title(x, vocabulary))
+    aggregated_data["ID"] = match_titles(aggregated_data["show"].tolist(), vocabulary)
 
     vector_size = len(vocabulary)
     sparse_vector = np.zeros(vector_size, dtype=int)
 
-    for _, row in aggregated_data.iterrows():
-        if row["ID"] != -1:
-            sparse_vector[row["ID"]] += row["Total_Views"]
+    ids = aggregated_data["ID"].to_numpy(dtype=np.int64)
+    matched = ids != -1
+    # Unbuffered scatter-add in C (repeated ids accumulate), no Python loop
+    np.add.at(sparse_vector, ids[matched], aggregated_data["Total_Views"].to_numpy(dtype=np.int64)[matched])
 
-    unmatched_titles = aggregated_data[aggregated_data["ID"] == -1]["show"].tolist()
+    unmatched_titles = aggregated_data["show"].to_numpy()[~matched].tolist()
     logging.info(f"(create_view_counts_vector) Unmatched Titles: {unmatched_titles}")
 
     return sparse_vector
@@ -12,6 +12,7 @@ import os
 import re
 import shutil
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -20,15 +21,70 @@ class PreflightError(RuntimeError):
     """Raised when required prerequisites are not met."""
 
 
-_EMAIL_LIKE_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+_EMAIL_LIKE_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$", re.ASCII)
+# Surrounding whitespace and quotes (e.g. from a quoted .env value) are ignored.
+_SYFT_USER_STRIP_CHARS = " \t\n\r\"'"
 
 
+@lru_cache(maxsize=16)
 def _is_valid_syft_user(value: str | None) -> bool:
     # SyftPermission currently accepts either an email-like identifier or '*'.
+    # Memoized: preflight re-checks the same AGGREGATOR_DATASITE and config email on every request.
     if value is None:
         return False
-    v = value.strip().strip('"').strip("'")
-    return v == "*" or bool(_EMAIL_LIKE_RE.match(v))
+    v = value.strip(_SYFT_USER_STRIP_CHARS)
+    if v == "*":
+        return True
+    return _EMAIL_LIKE_RE.match(v) is not None
+
+
+@lru_cache(maxsize=1)
+def _load_env_file() -> str | None:
+    """Load .env once per process; returns the loaded path (None if absent, or "unavailable")."""
+    try:
+        from dotenv import load_dotenv  # type: ignore
+
+        env_path = Path(__file__).parent.parent / ".env"
+        if env_path.exists():
+            load_dotenv(env_path)
+            return str(env_path)
+        return None
+    except Exception:
+        # Not fatal; environment variables may still be set by the user/shell.
+        return "unavailable"
+
+
+@lru_cache(maxsize=1)
+def _syft_client_config_class():
+    # syft_core is slow to import; only pay for it once the env checks pass.
+    from syft_core import SyftClientConfig  # type: ignore
+
+    return SyftClientConfig
+
+
+# (SYFTBOX_CLIENT_CONFIG_PATH, loaded config, mtime_ns of the file it was read from)
+_syft_config_cache = None
+
+
+def _load_syft_config(SyftClientConfig):
+    """`SyftClientConfig.load()`, reused while the config file it came from is unchanged."""
+    global _syft_config_cache
+    env_path = os.getenv("SYFTBOX_CLIENT_CONFIG_PATH")
+    cached = _syft_config_cache
+    if cached is not None and cached[0] == env_path:
+        try:
+            if os.stat(cached[1].path).st_mtime_ns == cached[2]:
+                return cached[1]
+        except OSError:
+            pass
+
+    cfg = SyftClientConfig.load()
+    try:
+        _syft_config_cache = (env_path, cfg, os.stat(cfg.path).st_mtime_ns)
+    except (AttributeError, OSError, TypeError):
+        # No file to watch; load again next time.
+        _syft_config_cache = None
+    return cfg
 
 
 @dataclass(frozen=True)
@@ -36,6 +92,9 @@ class PreflightResult:
     ok: bool
     checks: dict[str, Any]
     message: str
+    # The SyftClientConfig loaded during the check (only set when ok), so callers
+    # don't have to parse the config file a second time.
+    config: Any = None
 
 
 def run_preflight() -> PreflightResult:
@@ -48,18 +107,7 @@ def run_preflight() -> PreflightResult:
     checks: dict[str, Any] = {}
 
     # Load .env if present (so install-time checks match runtime behavior).
-    try:
-        from dotenv import load_dotenv  # type: ignore
-
-        env_path = Path(__file__).parent.parent / ".env"
-        if env_path.exists():
-            load_dotenv(env_path)
-            checks["dotenv_loaded"] = str(env_path)
-        else:
-            checks["dotenv_loaded"] = None
-    except Exception:
-        # Not fatal; environment variables may still be set by the user/shell.
-        checks["dotenv_loaded"] = "unavailable"
+    checks["dotenv_loaded"] = _load_env_file()
 
     # ---- App env checks
     aggregator = os.getenv("AGGREGATOR_DATASITE")
@@ -82,7 +130,7 @@ def run_preflight() -> PreflightResult:
     # ---- SyftBox checks (via syft-core)
     checks["syftbox_cli_found"] = bool(shutil.which("syftbox"))
     try:
-        from syft_core import SyftClientConfig  # type: ignore
+        SyftClientConfig = _syft_client_config_class()
     except Exception as e:  # pragma: no cover
         checks["syft_core_import_error"] = str(e)
         return PreflightResult(
@@ -97,7 +145,7 @@ def run_preflight() -> PreflightResult:
         )
 
     try:
-        cfg = SyftClientConfig.load()
+        cfg = _load_syft_config(SyftClientConfig)
         # Best-effort: common symptom in your reports.
         email = getattr(cfg, "email", None)
         checks["syftbox_config_loaded"] = True
@@ -149,6 +197,7 @@ def run_preflight() -> PreflightResult:
         ok=True,
         checks=checks,
         message="Preflight OK",
+        config=cfg,
     )
 
 
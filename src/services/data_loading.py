@@ -1,29 +1,156 @@
 """Data loading utilities for participant federated learning."""
 
-import json
 import logging
 import os
+from functools import lru_cache
 from pathlib import Path
 
 import numpy as np
+import orjson
+
+
+@lru_cache(maxsize=8)
+def _load_vocabulary_file(path: str, mtime_ns: int) -> dict:
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
 
 
 def load_tv_vocabulary(vocabulary_path):
-    """Load the TV series vocabulary from the specified JSON file."""
-    with open(vocabulary_path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    """
+    Load the TV series vocabulary from the specified JSON file.
+
+    The file is parsed once per modification time; callers share the returned
+    dict and must not modify it.
+    """
+    path = os.fspath(vocabulary_path)
+    return _load_vocabulary_file(path, os.stat(path).st_mtime_ns)
+
+
+@lru_cache(maxsize=64)
+def _child_path(folder, name: str) -> str:
+    """`os.path.join(folder, name)`, computed once per folder; the same few paths recur every round."""
+    return os.path.join(folder, name)
+
+
+RATINGS_DTYPE = np.float32
+
+
+def _npz_paths(private_folder, name):
+    """(name.npz, legacy pickled name.npy) in the private folder."""
+    base = _child_path(private_folder, name)
+    return base + ".npz", base + ".npy"
+
+
+def _ratings_paths(private_folder):
+    return _npz_paths(private_folder, "ratings")
+
+
+def has_participant_ratings(private_folder):
+    """Whether ratings were saved, in either format."""
+    return any(os.path.exists(path) for path in _ratings_paths(private_folder))
+
+
+def save_participant_ratings(private_folder, ratings):
+    """Save {title: rating} as parallel title/score arrays, so loading needs no pickle."""
+    ratings_path, _ = _ratings_paths(private_folder)
+    titles = np.array(list(ratings), dtype=str)
+    scores = np.fromiter(ratings.values(), dtype=RATINGS_DTYPE, count=len(ratings))
+    np.savez(ratings_path, titles=titles, scores=scores)
+    return ratings_path
 
 
 def load_participant_ratings(private_folder):
-    """Load participant's ratings from the private folder."""
-    ratings_path = os.path.join(private_folder, "ratings.npy")
-    return np.load(ratings_path, allow_pickle=True).item()
+    """Load participant's ratings ({title: rating}) from the private folder.
+
+    Ratings still in the legacy pickled ratings.npy are converted to ratings.npz once.
+    """
+    ratings_path, legacy_path = _ratings_paths(private_folder)
+    try:
+        with np.load(ratings_path, allow_pickle=False) as data:
+            return dict(zip(data["titles"].tolist(), data["scores"].tolist()))
+    except FileNotFoundError:
+        pass
+
+    ratings = np.load(legacy_path, allow_pickle=True).item()
+    save_participant_ratings(private_folder, ratings)
+    logging.info(f"Converted legacy {legacy_path} to {ratings_path}.")
+    return ratings
+
+
+# Aggregated activity columns (besides the "title" strings) and their dtypes
+ACTIVITY_DTYPES = {"week": np.int32, "n_watched": np.int32, "rating": np.float32}
+
+
+def _activity_paths(private_folder):
+    return _npz_paths(private_folder, "netflix_aggregated")
+
+
+def has_participant_activity(private_folder):
+    """Whether aggregated activity was saved, in either format."""
+    return any(os.path.exists(path) for path in _activity_paths(private_folder))
+
+
+def save_participant_activity(private_folder, title, week, n_watched, rating):
+    """Save aggregated activity as one array per column, so loading needs no pickle."""
+    activity_path, _ = _activity_paths(private_folder)
+    np.savez(
+        activity_path,
+        title=np.asarray(title, dtype=str),
+        **{
+            name: np.asarray(column, dtype=ACTIVITY_DTYPES[name])
+            for name, column in (("week", week), ("n_watched", n_watched), ("rating", rating))
+        },
+    )
+    return activity_path
+
+
+def load_participant_activity(private_folder):
+    """Load aggregated activity as columns {title, week, n_watched, rating}.
+
+    A legacy netflix_aggregated.npy is returned as saved: an object array of
+    (title, week, n_watched, rating) rows.
+    """
+    activity_path, legacy_path = _activity_paths(private_folder)
+    try:
+        with np.load(activity_path, allow_pickle=False) as data:
+            activity = {name: data[name] for name in ACTIVITY_DTYPES}
+            activity["title"] = data["title"].astype(object)
+        return {name: activity[name] for name in ("title", *ACTIVITY_DTYPES)}
+    except FileNotFoundError:
+        return np.load(legacy_path, allow_pickle=True)
 
 
 def load_global_item_factors(save_path):
-    """Load the global item factors matrix (V)."""
-    global_V_path = os.path.join(save_path, "global_V.npy")
-    return np.load(global_V_path)
+    """Load the global item factors matrix (V).
+
+    V may be stored in half precision to save bandwidth; it is widened to at
+    least float32 so local training never updates factors in float16.
+    """
+    global_V_path = _child_path(save_path, "global_V.npy")
+    global_V = np.load(global_V_path)
+    return global_V.astype(np.promote_types(global_V.dtype, np.float32), copy=False)
+
+
+# Shared generator for user-vector initialization
+_RNG = np.random.default_rng()
+
+# User vectors are stored and trained in single precision; plenty for latent
+# factors and half the bytes of float64 on every read/write.
+USER_MATRIX_DTYPE = np.float32
+
+
+@lru_cache(maxsize=4)
+def _load_user_matrix_file(path: str, mtime_ns: int) -> np.ndarray:
+    # Shared between calls, so handed out read-only; callers copy before updating.
+    U_u = np.load(path, allow_pickle=False).astype(USER_MATRIX_DTYPE, copy=False)
+    U_u.flags.writeable = False
+    return U_u
+
+
+def load_user_matrix(save_path):
+    """Load the saved user vector (U.npy), cached read-only until the file changes."""
+    user_matrix_path = _child_path(save_path, "U.npy")
+    return _load_user_matrix_file(user_matrix_path, os.stat(user_matrix_path).st_mtime_ns)
 
 
 def load_or_initialize_user_matrix(user_id, latent_dim, save_path):
@@ -35,16 +162,26 @@ def load_or_initialize_user_matrix(user_id, latent_dim, save_path):
       - Extending with small random values if smaller than latent_dim
       - Truncating if larger than latent_dim
     The adjusted vector is saved back to disk.
+
+    A loaded vector is cached until U.npy changes and is returned read-only.
     """
-    user_matrix_path = os.path.join(save_path, "U.npy")
-    if os.path.exists(user_matrix_path):
-        U_u = np.load(user_matrix_path)
+    user_matrix_path = _child_path(save_path, "U.npy")
+    try:
+        # One stat both checks the file exists and keys the cache.
+        mtime_ns = os.stat(user_matrix_path).st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = None
+    if mtime_ns is not None:
+        U_u = _load_user_matrix_file(user_matrix_path, mtime_ns)
         if U_u.shape != (latent_dim,):
             old_dim = U_u.shape[0]
             if old_dim < latent_dim:
-                # Extend with small random values
-                extension = np.random.normal(scale=0.01, size=(latent_dim - old_dim,))
-                U_u = np.concatenate([U_u, extension])
+                # Extend with small random values, drawn straight into the new vector
+                extended = np.empty(latent_dim, dtype=USER_MATRIX_DTYPE)
+                extended[:old_dim] = U_u
+                _RNG.standard_normal(dtype=USER_MATRIX_DTYPE, out=extended[old_dim:])
+                extended[old_dim:] *= 0.01
+                U_u = extended
                 logging.info(
                     f"Resized user matrix for {user_id} from {old_dim} -> {latent_dim} (extended)."
                 )
@@ -54,9 +191,8 @@ def load_or_initialize_user_matrix(user_id, latent_dim, save_path):
                 logging.info(
                     f"Resized user matrix for {user_id} from {old_dim} -> {latent_dim} (truncated)."
                 )
-            # Persist the resized vector
-            os.makedirs(save_path, exist_ok=True)
-            np.save(user_matrix_path, U_u)
+            # Persist the resized vector (save_path exists, U.npy was just read from it)
+            np.save(user_matrix_path, U_u, allow_pickle=False)
         else:
             logging.info(f"Loaded existing user matrix for {user_id}.")
     else:
@@ -67,8 +203,9 @@ def load_or_initialize_user_matrix(user_id, latent_dim, save_path):
 def initialize_user_matrix(user_id, latent_dim, save_path):
     """Initialize a new user matrix with random values."""
     os.makedirs(save_path, exist_ok=True)
-    U_u = np.random.normal(scale=0.01, size=(latent_dim,))
-    user_matrix_path = os.path.join(save_path, "U.npy")
-    np.save(user_matrix_path, U_u)
+    U_u = _RNG.standard_normal(latent_dim, dtype=USER_MATRIX_DTYPE)
+    U_u *= 0.01
+    user_matrix_path = _child_path(save_path, "U.npy")
+    np.save(user_matrix_path, U_u, allow_pickle=False)
     logging.info(f"Initialized and saved user matrix for {user_id}.")
     return U_u
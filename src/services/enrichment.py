@@ -1,21 +1,54 @@
 """Data enrichment services for recommendations."""
 
-import csv
-import math
 import logging
+from collections import namedtuple
+from functools import lru_cache
+from math import isfinite
+from operator import attrgetter
 from pathlib import Path
+from sys import intern
+
+import pandas as pd
 
 from src.config import DATA_DIR
 
 # Cache for Netflix titles data
 _netflix_titles_cache = None
 
+# Title normalization for lookups (casefold is the Unicode-correct lower())
+_casefold = str.casefold
+
+# Cached field -> augmented_titles.csv column (tmdb_score is parsed separately)
+_TITLE_FIELDS = {
+    "show_id": "show_id",
+    "type": "type",
+    "director": "director",
+    "cast": "cast",
+    "country": "country",
+    "date_added": "date_added",
+    "release_year": "release_year",
+    "rating": "rating",
+    "duration": "duration",
+    "genres": "listed_in",
+    "description": "description",
+    "cover_url": "cover_url",
+    "tmdb_id": "tmdb_id",
+    "imdb_id": "imdb_id",
+}
+_TITLE_COLUMNS = ["title", "tmdb_score", *_TITLE_FIELDS.values()]
+_TITLE_COLUMN_SET = frozenset(_TITLE_COLUMNS)
+# Fields with few distinct values; interned so all titles share one copy of each
+_CATEGORICAL_FIELDS = frozenset({"type", "country", "rating"})
+
+# One record per title; a tuple is far smaller than a per-row dict.
+TitleRecord = namedtuple("TitleRecord", [*_TITLE_FIELDS, "tmdb_score"])
+
 
 def load_netflix_titles():
     """Load and cache Netflix titles data for enrichment.
     
     Uses augmented_titles.csv as the single source of data with semicolon separator.
-    Includes cover_url and tmdb_score fields.
+    Maps each casefolded title to a `TitleRecord` (including cover_url and tmdb_score).
     """
     global _netflix_titles_cache
     if _netflix_titles_cache is not None:
@@ -25,36 +58,31 @@ def load_netflix_titles():
     _netflix_titles_cache = {}
     
     try:
-        with open(netflix_titles_path, "r", encoding="utf-8") as f:
-            # Use semicolon as delimiter for augmented_titles.csv
-            reader = csv.DictReader(f, delimiter=';')
-            for row in reader:
-                title = row.get("title", "").strip()
-                if title:
-                    # Parse tmdb_score, handling empty or invalid values
-                    tmdb_score = row.get("tmdb_score", "")
-                    try:
-                        tmdb_score = float(tmdb_score) if tmdb_score else None
-                    except (ValueError, TypeError):
-                        tmdb_score = None
-                    
-                    _netflix_titles_cache[title.lower()] = {
-                        "show_id": row.get("show_id", ""),
-                        "type": row.get("type", ""),
-                        "director": row.get("director", ""),
-                        "cast": row.get("cast", ""),
-                        "country": row.get("country", ""),
-                        "date_added": row.get("date_added", ""),
-                        "release_year": row.get("release_year", ""),
-                        "rating": row.get("rating", ""),
-                        "duration": row.get("duration", ""),
-                        "genres": row.get("listed_in", ""),
-                        "description": row.get("description", ""),
-                        "cover_url": row.get("cover_url", ""),
-                        "tmdb_score": tmdb_score,
-                        "tmdb_id": row.get("tmdb_id", ""),
-                        "imdb_id": row.get("imdb_id", ""),
-                    }
+        # Parse the whole file in one pass; keep every field as the raw string
+        # (empty, not NaN, when missing) as csv.DictReader would.
+        # Only the columns that end up in the cache are tokenized into strings.
+        df = pd.read_csv(
+            netflix_titles_path,
+            sep=";",
+            dtype=str,
+            keep_default_na=False,
+            encoding="utf-8",
+            usecols=_TITLE_COLUMN_SET.__contains__,
+        )
+        df = df.reindex(columns=_TITLE_COLUMNS, fill_value="").fillna("")
+        titles = df["title"].str.strip()
+        # Empty or invalid scores become None
+        tmdb_scores = pd.to_numeric(df["tmdb_score"], errors="coerce").astype(object)
+        tmdb_scores = tmdb_scores.where(tmdb_scores.notna(), None)
+
+        columns = [
+            list(map(intern, df[column].tolist())) if field in _CATEGORICAL_FIELDS else df[column].tolist()
+            for field, column in _TITLE_FIELDS.items()
+        ]
+        records = map(TitleRecord._make, zip(*columns, tmdb_scores.tolist()))
+        for title, record in zip(titles.tolist(), records):
+            if title:
+                _netflix_titles_cache[intern(_casefold(title))] = record
         logging.info(f"Loaded {len(_netflix_titles_cache)} Netflix titles for enrichment from augmented_titles.csv")
     except Exception as e:
         logging.error(f"Failed to load Netflix titles: {e}")
@@ -63,6 +91,48 @@ def load_netflix_titles():
     return _netflix_titles_cache
 
 
+_DETAIL_FIELDS = (
+    "type",
+    "release_year",
+    "duration",
+    "genres",
+    "description",
+    "director",
+    "cast",
+    "country",
+    "tmdb_id",
+    "imdb_id",
+)
+_EMPTY_DETAILS = dict.fromkeys(_DETAIL_FIELDS, "")
+_detail_values = attrgetter(*_DETAIL_FIELDS)
+
+
+_NO_TITLE_DETAILS = (None, "", _EMPTY_DETAILS)
+
+
+@lru_cache(maxsize=8192)
+def _title_details(name: str):
+    """
+    Per-title part of an enriched item: (tmdb_score, cover_url, details).
+
+    The same titles are recommended to many users, so this is built once per
+    item name (normalization included). `details` is shared between calls and
+    must not be mutated.
+    """
+    title_data = load_netflix_titles().get(_casefold(name).strip())
+    if not title_data:
+        return _NO_TITLE_DETAILS
+    details = dict(zip(_DETAIL_FIELDS, _detail_values(title_data)))
+    return title_data.tmdb_score, title_data.cover_url, details
+
+
+def _sanitize_json_value(value, default):
+    """Replace NaN/inf (not valid JSON) with `default`; anything else passes through."""
+    if isinstance(value, float) and not isfinite(value):
+        return default
+    return value
+
+
 def enrich_recommendation(item):
     """Enrich a recommendation item with full details from Netflix titles.
     
@@ -70,71 +140,30 @@ def enrich_recommendation(item):
     - cover_url for poster images
     - tmdb_score for ratings (used instead of imdb_score)
     """
-    netflix_titles = load_netflix_titles()
-    title_lower = item.get("name", "").lower().strip()
-    
-    def _sanitize_json_value(value, *, default_string=""):
-        if isinstance(value, float):
-            if math.isnan(value) or math.isinf(value):
-                return default_string
-        return value
+    name = item.get("name")
+    title_tmdb_score, cover_url, details = _title_details(name) if name else _NO_TITLE_DETAILS
 
     # Sanitize fields that can contain NaN
-    raw_score = _sanitize_json_value(item.get("raw_score", 0.0), default_string=0.0)
-    rating = _sanitize_json_value(item.get("rating", "N/A"), default_string="N/A")
-    language = _sanitize_json_value(item.get("language", "N/A"), default_string="N/A")
-    # Use tmdb score from item if present, otherwise fall back to imdb for compatibility
-    tmdb_score = _sanitize_json_value(item.get("tmdb_score", item.get("imdb", "N/A")), default_string="N/A")
-    img = _sanitize_json_value(item.get("img", ""), default_string="")
-
-    # Start with existing data
-    enriched = {
+    raw_score = _sanitize_json_value(item.get("raw_score", 0.0), 0.0)
+    rating = _sanitize_json_value(item.get("rating", "N/A"), "N/A")
+    language = _sanitize_json_value(item.get("language", "N/A"), "N/A")
+    # Prefer the TMDB score from title data, then the item's, then imdb for compatibility
+    if title_tmdb_score is not None:
+        tmdb_score = title_tmdb_score
+    else:
+        tmdb_score = _sanitize_json_value(item.get("tmdb_score", item.get("imdb", "N/A")), "N/A")
+    img = _sanitize_json_value(item.get("img", ""), "")
+    # Fall back to the title's cover image when the item has none
+    if cover_url and not img:
+        img = cover_url
+
+    return {
         "id": item.get("id"),
         "name": item.get("name"),
         "img": img,
         "imdb": tmdb_score,  # Keep "imdb" key for UI compatibility, but use TMDB score
         "rating": rating,
         "language": language,
-        "raw_score": raw_score
+        "raw_score": raw_score,
+        **details,
     }
-    
-    # Try to find matching title in Netflix titles data
-    title_data = netflix_titles.get(title_lower)
-    if title_data:
-        # Get TMDB score from title data if available
-        title_tmdb_score = title_data.get("tmdb_score")
-        if title_tmdb_score is not None:
-            enriched["imdb"] = title_tmdb_score
-        
-        # Get cover image from title data if not already set
-        cover_url = title_data.get("cover_url", "")
-        if cover_url and not enriched["img"]:
-            enriched["img"] = cover_url
-        
-        enriched.update({
-            "type": title_data.get("type", ""),
-            "release_year": title_data.get("release_year", ""),
-            "duration": title_data.get("duration", ""),
-            "genres": title_data.get("genres", ""),
-            "description": title_data.get("description", ""),
-            "director": title_data.get("director", ""),
-            "cast": title_data.get("cast", ""),
-            "country": title_data.get("country", ""),
-            "tmdb_id": title_data.get("tmdb_id", ""),
-            "imdb_id": title_data.get("imdb_id", ""),
-        })
-    else:
-        enriched.update({
-            "type": "",
-            "release_year": "",
-            "duration": "",
-            "genres": "",
-            "description": "",
-            "director": "",
-            "cast": "",
-            "country": "",
-            "tmdb_id": "",
-            "imdb_id": "",
-        })
-    
-    return enriched
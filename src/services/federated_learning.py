@@ -2,11 +2,11 @@
 
 import json
 import logging
-import os
 from datetime import datetime
 from pathlib import Path
 
 import numpy as np
+import pandas as pd
 
 from src.config import APP_NAME
 from src.core import (
@@ -17,6 +17,12 @@ from src.core import (
 )
 from src.federated_learning.sequence_data import SequenceData, create_view_counts_vector
 from src.federated_learning.bpr_participant_finetuning import participant_fine_tuning
+from src.services.data_loading import (
+    has_participant_ratings,
+    save_participant_activity,
+    save_participant_ratings,
+)
+from src.utils.ttl_cache import ttl_cache
 
 
 # Status tracking
@@ -60,28 +66,38 @@ def clear_user_models(private_folder):
     ]
     
     for file_path in files_to_delete:
-        if file_path.exists():
-            try:
-                os.remove(file_path)
-                logging.info(f"Cleared existing user model: {file_path}")
-            except Exception as e:
-                logging.warning(f"Could not delete {file_path}: {e}")
+        # One unlink per file; a missing file is simply nothing to clear.
+        try:
+            file_path.unlink()
+            logging.info(f"Cleared existing user model: {file_path}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"Could not delete {file_path}: {e}")
 
 
 def load_csv_to_numpy(file_path: str) -> np.ndarray:
     """Load a CSV file into a NumPy array, skipping empty rows."""
-    import csv
-    cleaned_data = []
-    with open(file_path, mode="r", encoding="utf-8") as file:
-        reader = csv.reader(file)
-        next(reader)  # Skip header
-        for row in reader:
-            # Skip empty rows or rows that don't have expected columns
-            if row and len(row) >= 2 and row[0].strip():
-                cleaned_data.append(row)
-    return np.array(cleaned_data)
+    # Parsed by pandas' C reader in one pass. Every field stays a string; only
+    # empty or missing fields are NaN (so a title like "NA" is kept as is).
+    df = pd.read_csv(
+        file_path,
+        header=0,
+        dtype=str,
+        keep_default_na=False,
+        na_values=[""],
+        skip_blank_lines=True,
+        encoding="utf-8",
+    )
+    # A file with only a title column has no usable rows
+    if df.shape[1] < 2:
+        return np.empty((0, 2), dtype=object)
+    # Skip rows without both a title and a date, or with a blank title
+    df = df.iloc[:, :2].dropna()
+    return df[df.iloc[:, 0].str.strip() != ""].to_numpy()
 
 
+@ttl_cache(seconds=0.5)
 def check_viewing_history_exists(profile: str = "profile_0") -> dict:
     """
     Check if viewing history is available and return details.
@@ -146,21 +162,21 @@ def prepare_participant_data(
     # Augment viewing history with click history (clicked items = implicit watches)
     if click_history and len(click_history) > 0:
         logging.info(f"Augmenting viewing history with {len(click_history)} clicked items...")
-        click_entries = []        
-        for click in click_history:
-            name = click.get('name', '')
-            if name:
-                # Add as a viewing entry: [Title, Date]
-                click_entry = [name, datetime.now().strftime('%d/%m/%Y')]
-                click_entries.append(click_entry)
+        # Add each click as a viewing entry: [Title, Date]
+        today = datetime.now().strftime('%d/%m/%Y')
+        click_entries = [[name, today] for name in (click.get('name', '') for click in click_history) if name]
         
         if click_entries:
-            click_array = np.array(click_entries)
-            viewing_history = np.vstack([viewing_history, click_array])
+            # Object dtype keeps every title intact whatever the history's string width;
+            # one concatenate, no per-row work.
+            click_array = np.array(click_entries, dtype=object)
+            viewing_history = np.concatenate([viewing_history, click_array])
             logging.info(f"Added {len(click_entries)} click entries to viewing history.")
 
-        logging.info(f"click entries: {click_entries}")
-        logging.info(f"viewing history: {viewing_history}")
+        # Only a preview, and only formatted when debug logging is on
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(f"click entries: {click_entries[:5]!r} (total={len(click_entries)})")
+            logging.debug(f"viewing history head: {viewing_history[:5]!r} (total={len(viewing_history)})")
 
     # Create sequence data
     sequence_recommender = SequenceData(viewing_history)
@@ -178,35 +194,19 @@ def prepare_participant_data(
 
     # Create ratings dictionary from sequence data
     # (convert view counts to implicit ratings - watched = positive signal)
-    ratings = {}
-    for _, row in sequence_recommender.aggregated_data.iterrows():
-        show_name = row["show"]
-        # Implicit rating based on view count (normalized)
-        total_views = row["Total_Views"]
-        implicit_rating = min(5.0, 1.0 + np.log1p(total_views))  # Log scale, capped at 5
-        ratings[show_name] = implicit_rating
+    shows, first_seen, total_views = sequence_recommender.to_numpy_columns()
+    # Implicit rating based on view count (normalized): log scale, capped at 5
+    implicit_ratings = np.minimum(5.0, 1.0 + np.log1p(total_views))
+    ratings = dict(zip(shows.tolist(), implicit_ratings.tolist()))
     
     # Save ratings
-    ratings_path = private_folder / "ratings.npy"
-    np.save(str(ratings_path), ratings)
+    ratings_path = save_participant_ratings(private_folder, ratings)
     logging.debug(f"Ratings saved to {ratings_path}.")
 
     # Create aggregated activity for recommendations
-    # Format: (title, week, n_watched, rating)
-    aggregated_data = sequence_recommender.aggregated_data
-    activity_list = []
-    for _, row in aggregated_data.iterrows():
-        week = row["First_Seen"].isocalendar()[1] if hasattr(row["First_Seen"], "isocalendar") else 1
-        activity_list.append([
-            row["show"],
-            week,
-            row["Total_Views"],
-            ratings.get(row["show"], 3.0)
-        ])
-    
-    activity_array = np.array(activity_list, dtype=object)
-    activity_path = private_folder / "netflix_aggregated.npy"
-    np.save(str(activity_path), activity_array)
+    # Format: (title, week, n_watched, rating); week 1 when the first view has no date
+    weeks = pd.DatetimeIndex(first_seen).isocalendar().week.fillna(1).to_numpy(dtype=np.int64)
+    activity_path = save_participant_activity(private_folder, shows, weeks, total_views, implicit_ratings)
     logging.debug(f"Aggregated activity saved to {activity_path}.")
 
     return sequence_recommender, view_counts_vector, ratings
@@ -263,8 +263,7 @@ def run_fine_tuning(profile: str = "profile_0", epsilon: float = 1.0):
             return False
         
         # Check if we have ratings data
-        ratings_path = private_folder / "ratings.npy"
-        if not ratings_path.exists():
+        if not has_participant_ratings(private_folder):
             # Try to prepare data from viewing history
             logging.info("Ratings not found, attempting to prepare from viewing history...")
             file_path, viewing_history = get_viewing_history(profile)
@@ -433,9 +432,9 @@ def run_full_fl_workflow(profile: str = "profile_0", epsilon: float = 1.0, click
         success = run_fine_tuning(profile, epsilon)
         
         if success:
-            # Step 5: Trigger recommendations
-            from src.services.recommendations import run_recommendation_computation
-            run_recommendation_computation()
+            # Step 5: Trigger recommendations (computed in the background; the UI polls their status)
+            from src.services.recommendations import submit_recommendation_computation
+            submit_recommendation_computation()
         
         return success
         
@@ -467,6 +466,14 @@ def run_full_fl_workflow(profile: str = "profile_0", epsilon: float = 1.0, click
         return False
 
 
+def _mtime(path):
+    """Modification time of `path`, or None if it doesn't exist (one stat call)."""
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+
 def check_fine_tuning_needed(profile: str = "profile_0"):
     """
     Check if fine-tuning is needed based on:
@@ -480,23 +487,21 @@ def check_fine_tuning_needed(profile: str = "profile_0"):
     
     # Check if delta_V exists
     delta_v_path = restricted_public_folder / "svd_training" / "delta_V.npy"
-    if not delta_v_path.exists():
+    delta_mtime = _mtime(delta_v_path)
+    if delta_mtime is None:
         logging.info("delta_V.npy not found - fine-tuning needed")
         return True
     
     # Check if U.npy exists (user matrix)
     u_path = private_folder / "svd_training" / "U.npy"
-    if not u_path.exists():
+    if _mtime(u_path) is None:
         logging.info("U.npy not found - fine-tuning needed")
         return True
     
     # Check timestamps - if global_V is newer than our delta_V, we should re-train
-    global_v_path = restricted_shared_folder / "global_V.npy"
-    if global_v_path.exists() and delta_v_path.exists():
-        global_mtime = global_v_path.stat().st_mtime
-        delta_mtime = delta_v_path.stat().st_mtime
-        if global_mtime > delta_mtime:
-            logging.info("global_V.npy is newer than delta_V.npy - fine-tuning needed")
-            return True
+    global_mtime = _mtime(restricted_shared_folder / "global_V.npy")
+    if global_mtime is not None and global_mtime > delta_mtime:
+        logging.info("global_V.npy is newer than delta_V.npy - fine-tuning needed")
+        return True
     
     return False
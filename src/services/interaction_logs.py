@@ -0,0 +1,127 @@
+"""Buffered CSV writer for interaction logs."""
+
+import asyncio
+import atexit
+import csv
+import io
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+
+class InteractionLogWriter:
+    """
+    Append rows to CSV files through long-lived file handles.
+
+    Opening, writing and closing a file for every logged event costs several
+    syscalls per row. Instead rows are buffered in memory per log and written
+    every `flush_every` rows, or by `flush_stale()` once `flush_interval`
+    seconds have passed since its last flush; each flush is one write().
+
+    SyftBox sync (or the user) may replace or delete a log while its handle is
+    open. Before each write the handle's inode is compared with the path's; if
+    they differ the file is reopened, so rows never go to an unlinked file.
+    `on_reopen(path)` is then called, e.g. to have the header checked again.
+    """
+
+    def __init__(self, flush_every: int = 16, flush_interval: float = 1.0, on_reopen=None):
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.on_reopen = on_reopen
+        # path -> [file or None, row buffer, csv writer on the buffer, rows since last flush,
+        #          last flush time, header]
+        self._handles: dict[Path, list] = {}
+        self._lock = threading.Lock()
+
+    def append_row(self, path: Path, row, header=None) -> None:
+        """Append a single row to the CSV at `path`.
+
+        `header` is written first whenever the file is (re)created empty.
+        """
+        with self._lock:
+            entry = self._handles.get(path)
+            if entry is None:
+                buffer = io.StringIO()
+                entry = [None, buffer, csv.writer(buffer), 0, time.monotonic(), header]
+                self._handles[path] = entry
+
+            entry[2].writerow(row)
+            entry[3] += 1
+            if entry[3] >= self.flush_every:
+                self._flush_entry(path, entry)
+
+    def flush_stale(self) -> None:
+        """Flush logs with pending rows that have not been flushed recently."""
+        now = time.monotonic()
+        with self._lock:
+            for path, entry in self._handles.items():
+                if entry[3] and now - entry[4] >= self.flush_interval:
+                    self._flush_entry(path, entry)
+
+    def close(self) -> None:
+        """Flush and close all open logs."""
+        with self._lock:
+            for path, entry in self._handles.items():
+                self._flush_entry(path, entry)
+                if entry[0] is None:
+                    continue
+                try:
+                    entry[0].close()
+                except Exception as e:
+                    logging.warning(f"Could not close interaction log {path}: {e}")
+            self._handles.clear()
+
+    async def run_periodic_flush(self) -> None:
+        """Flush stale logs forever; run as a task for the lifetime of the app."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.flush_stale()
+
+    def _open(self, path: Path, entry: list):
+        """Return the entry's file, reopening it if `path` no longer refers to it."""
+        f = entry[0]
+        if f is not None:
+            try:
+                on_disk = os.stat(path)
+                handle = os.fstat(f.fileno())
+                if (on_disk.st_ino, on_disk.st_dev) == (handle.st_ino, handle.st_dev):
+                    return f
+            except FileNotFoundError:
+                pass
+            logging.info(f"Interaction log {path} was replaced or removed; reopening it.")
+            try:
+                f.close()
+            except Exception as e:
+                logging.warning(f"Could not close interaction log {path}: {e}")
+            entry[0] = None
+
+        reopened = f is not None
+        f = open(path, "a", newline="", encoding="utf-8")
+        entry[0] = f
+        if entry[5] is not None and f.tell() == 0:
+            csv.writer(f).writerow(entry[5])
+        if reopened and self.on_reopen is not None:
+            self.on_reopen(path)
+        return f
+
+    def _flush_entry(self, path: Path, entry: list) -> None:
+        buffer = entry[1]
+        if buffer.tell():
+            try:
+                f = self._open(path, entry)
+                f.write(buffer.getvalue())
+                f.flush()
+            except OSError as e:
+                # Rows stay buffered and are retried on the next flush.
+                logging.warning(f"Could not write interaction log {path}: {e}")
+                return
+            buffer.seek(0)
+            buffer.truncate()
+        entry[3] = 0
+        entry[4] = time.monotonic()
+
+
+interaction_log_writer = InteractionLogWriter()
+atexit.register(interaction_log_writer.close)
@@ -1,9 +1,21 @@
 """File I/O operations for recommendations."""
 
-import json
+import os
+import threading
+
+import orjson
+
 from src.core import get_private_path
+from src.utils.ttl_cache import ttl_cache
+
+# Parsed recommendations, reused until either file's mtime changes:
+# ((raw_mtime, reranked_mtime), (raw_recommends, reranked_recommends, by_id))
+_recommendations_cache = None
+# Requests and the recomputation thread may load concurrently; only one re-parses.
+_recommendations_lock = threading.Lock()
 
 
+@ttl_cache(seconds=0.5)
 def recommendations_exist():
     """Check if recommendation files exist."""
     participant_private_path = get_private_path()
@@ -12,20 +24,62 @@ def recommendations_exist():
     return raw_results.exists() and reranked_results.exists()
 
 
-def load_recommendations():
-    """Load recommendation data from JSON files."""
+def _sorted_by_score(recommends):
+    """Recommendations best-first; files are written sorted, so this is normally a pass-through."""
+    scores = [rec["raw_score"] for rec in recommends]
+    if all(a >= b for a, b in zip(scores, scores[1:])):
+        return recommends
+    # Written by an older version
+    return sorted(recommends, key=lambda x: x["raw_score"], reverse=True)
+
+
+def load_recommendations_indexed():
+    """
+    Load recommendation data from JSON files, plus an index by item id.
+
+    The parsed lists are cached and only re-read when one of the files changes,
+    so callers must not mutate the returned lists or items.
+
+    Returns:
+        tuple: (raw_recommends, reranked_recommends, by_id) where `by_id` maps an
+        item id to its entry (raw list first, then re-ranked).
+    """
+    global _recommendations_cache
+
     participant_private_path = get_private_path()
     raw_results = participant_private_path / "raw_recommendations.json"
     reranked_results = participant_private_path / "reranked_recommendations.json"
 
-    with open(raw_results, "r", encoding="utf-8") as f:
-        all_raw_recommends = json.load(f)
+    mtimes = (os.stat(raw_results).st_mtime_ns, os.stat(reranked_results).st_mtime_ns)
+    cache = _recommendations_cache
+    if cache is not None and cache[0] == mtimes:
+        return cache[1]
+
+    with _recommendations_lock:
+        cache = _recommendations_cache
+        if cache is not None and cache[0] == mtimes:
+            return cache[1]
+
+        with open(raw_results, "rb") as f:
+            all_raw_recommends = orjson.loads(f.read())
+
+        with open(reranked_results, "rb") as f:
+            all_reranked_recommends = orjson.loads(f.read())
 
-    with open(reranked_results, "r", encoding="utf-8") as f:
-        all_reranked_recommends = json.load(f)
+        # Return all saved recommendations sorted by score
+        raw_recommends = _sorted_by_score(all_raw_recommends)
+        reranked_recommends = _sorted_by_score(all_reranked_recommends)
 
-    # Return all saved recommendations sorted by score
-    raw_recommends = sorted(all_raw_recommends, key=lambda x: x["raw_score"], reverse=True)
-    reranked_recommends = sorted(all_reranked_recommends, key=lambda x: x["raw_score"], reverse=True)
+        by_id = {}
+        for rec in raw_recommends + reranked_recommends:
+            by_id.setdefault(rec.get("id"), rec)
 
+        payload = (raw_recommends, reranked_recommends, by_id)
+        _recommendations_cache = (mtimes, payload)
+        return payload
+
+
+def load_recommendations():
+    """Load recommendation data from JSON files."""
+    raw_recommends, reranked_recommends, _ = load_recommendations_indexed()
     return raw_recommends, reranked_recommends
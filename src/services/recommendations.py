@@ -1,153 +1,216 @@
 """Recommendation computation service."""
 
 import os
-import json
 import math
 import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 import numpy as np
+import orjson
 import pandas as pd
 
 from src.core import get_private_path, get_shared_folder_path
+from src.services.data_loading import (
+    ACTIVITY_DTYPES,
+    load_participant_activity,
+    load_tv_vocabulary,
+    load_user_matrix,
+)
+from src.services.io import recommendations_exist
 from src.config import DATA_DIR
 
 
 from src.config import DATA_DIR, DISPLAY_SCORE_METHOD
 
 
-def _apply_display_normalization(scores, method):
-    """Return a list of normalized scores in [0,1] according to method."""
-    import numpy as _np
-    scores = _np.array(scores, dtype=float)
-    if method is None or method == "none":
-        return scores
-    if method == "sigmoid":
-        return 1 / (1 + _np.exp(-scores))
-    if method == "minmax":
-        if scores.size == 0:
-            return scores
-        min_s = float(scores.min())
-        max_s = float(scores.max())
-        if max_s - min_s == 0:
-            return _np.zeros_like(scores)
-        return (scores - min_s) / (max_s - min_s)
-    # Unknown method: return original
-    return scores
-
-
-def get_recommendations_data(recommendation_list, df, display_normalization=None):
+_METADATA_COLUMNS = ["cover_url", "rating", "tmdb_score"]
+
+
+@lru_cache(maxsize=2)
+def _read_titles_metadata(path: str, mtime_ns: int) -> pd.DataFrame:
+    """The title and metadata columns of augmented_titles.csv, parsed once per file version."""
+    wanted = {"title", *_METADATA_COLUMNS}
+    return pd.read_csv(path, sep=";", usecols=wanted.__contains__)
+
+
+def load_titles_metadata(csv_file_path) -> pd.DataFrame:
+    """Return the (cached) titles DataFrame; callers must not modify it."""
+    path = os.fspath(csv_file_path)
+    return _read_titles_metadata(path, os.stat(path).st_mtime_ns)
+
+
+# Title index of the last DataFrame passed to get_recommendations_data: (df, index)
+_metadata_index_cache = None
+
+
+def _title_metadata_index(df):
+    """Map stripped title -> (img, rating, tmdb_score) of its first row, with UI defaults filled in."""
+    global _metadata_index_cache
+    cache = _metadata_index_cache
+    if cache is not None and cache[0] is df:
+        return cache[1]
+
+    metadata = df.reindex(columns=_METADATA_COLUMNS)
+    # Defaults applied once per frame, so the per-item loop reads plain values
+    img = metadata["cover_url"].astype(object).where(metadata["cover_url"].notna(), "")
+    rating = metadata["rating"].astype(object).where(metadata["rating"].notna() & (metadata["rating"] != ""), "N/A")
+    rating = rating.map(str)
+    tmdb_score = metadata["tmdb_score"].astype(object).where(metadata["tmdb_score"].notna(), "N/A")
+
+    index = {}
+    for title, row in zip(df["title"].tolist(), zip(img.tolist(), rating.tolist(), tmdb_score.tolist())):
+        if isinstance(title, str):
+            index.setdefault(title.strip(), row)
+    _metadata_index_cache = (df, index)
+    return index
+
+
+def get_recommendations_data(recommendation_list, df):
     """Convert recommendation list to enriched data with metadata from DataFrame.
-    
-    display_normalization: None | 'sigmoid' | 'minmax' - applied per-user to scores for UI display
+
+    Scores are already normalized for display by `compute_recommendations`
+    (DISPLAY_SCORE_METHOD); each entry's count is derived from its raw score.
     """
     recommendations_data = []
 
-    # Prepare normalized display scores if requested
-    if display_normalization is None:
-        display_normalization = DISPLAY_SCORE_METHOD
-
-    raw_scores = [float(s) for _, _, s in recommendation_list]
-    display_scores = _apply_display_normalization(raw_scores, display_normalization)
+    metadata = _title_metadata_index(df)
+    # Per-item score lines, emitted as one debug record after the loop
+    debug_lines = [] if logging.getLogger().isEnabledFor(logging.DEBUG) else None
 
     for i, (name, idx, score) in enumerate(recommendation_list):
-        display_score = float(display_scores[i]) if i < len(display_scores) else None
-
-        try:
-            row = df[df["title"].str.strip() == name].iloc[0]
-        except IndexError:
+        row = metadata.get(name)
+        if row is None:
             logging.warning(f"Could not find metadata for: {name}")
             continue
+        img, rating, tmdb_score = row
             
         safe_score = float(score) if not math.isnan(score) else 0.0
 
         # Determine a user-friendly 'count' for the UI:
         # Use absolute percent based on raw model score: raw_score * 100 when in [0,1], otherwise round raw_score.
-        if safe_score <= 1:
-            count = int(round(safe_score * 100))
-        else:
-            count = int(round(safe_score))
+        count = round(safe_score * 100) if safe_score <= 1 else round(safe_score)
         # Clamp to 0-100 for UI
-        count = max(0, min(100, count))
+        count = 0 if count < 0 else 100 if count > 100 else count
 
         # Log console output: show raw score and computed count (absolute percent)
-        logging.debug(f"{i+1} => {name}: raw={safe_score:.4f}, count={count} (absolute percent based on raw_score)")
+        if debug_lines is not None:
+            debug_lines.append(f"{i+1} => {name}: raw={safe_score:.4f}, count={count}")
 
-        # Get cover image from augmented_titles.csv
-        img = row["cover_url"] if pd.notna(row.get("cover_url")) else ""
-        
-        # Language not available
-        language = "N/A"
-        
-        # rating column contains content rating (TV-MA, PG, etc.)
-        rating = row["rating"] if pd.notna(row.get("rating")) else "N/A"
-        rating = str(rating) if rating not in (None, "") else "N/A"
-        
-        # Use tmdb_score instead of imdb_score
-        tmdb_score = row["tmdb_score"] if pd.notna(row.get("tmdb_score")) else "N/A"
-        
-        entry = {
+        recommendations_data.append({
             "id": int(idx),
             "name": name,
-            "language": language,
+            "language": "N/A",  # Language not available
             "rating": rating,
             "imdb": tmdb_score,  # Keep "imdb" key for UI compatibility, but use TMDB score
             "tmdb_score": tmdb_score,
             "img": img,
             "count": count,
             "raw_score": safe_score,
-        }
-        recommendations_data.append(entry)
+        })
+
+    if debug_lines:
+        logging.debug("Scores (count is the absolute percent based on raw_score):\n" + "\n".join(debug_lines))
     return recommendations_data
 
 
+def _mtime_ns(path):
+    """Modification time of `path` in ns, or None if it doesn't exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+# Inputs and results of the last local_recommendation call:
+# (key, tv_vocab, raw_data, reranked_data)
+_last_recommendations = None
+
+
 def local_recommendation(local_path, global_path, tv_vocab, exclude_watched=True, additional_watched=None):
     """Main entry point for local recommendation generation."""
-    from src.federated_learning.bpr_participant_local_recommendation import compute_recommendations
+    from src.federated_learning.bpr_participant_local_recommendation import (
+        compute_recommendations,
+        to_activity_columns,
+    )
 
     global_V_path = os.path.join(global_path, "global_V.npy")
-    user_U_path = os.path.join(local_path, "svd_training", "U.npy")
-    user_aggregated_activity_path = os.path.join(local_path, "netflix_aggregated.npy")
-    
+    user_U_dir = os.path.join(local_path, "svd_training")
+    user_U_path = os.path.join(user_U_dir, "U.npy")
+    activity_base = os.path.join(local_path, "netflix_aggregated")
+
+    # One stat per input file, used both to check it exists and to key the result cache
+    V_mtime, U_mtime, activity_mtime, legacy_activity_mtime, titles_mtime = map(_mtime_ns, (
+        global_V_path, user_U_path, activity_base + ".npz", activity_base + ".npy",
+        DATA_DIR / "augmented_titles.csv",
+    ))
+
     # Check for global model file
-    if not os.path.exists(global_V_path):
+    if V_mtime is None:
         logging.error(f"Global model not found: {global_V_path}")
         raise FileNotFoundError(f"global_V.npy not found at {global_V_path}")
     
-    if not os.path.exists(user_U_path) or not os.path.exists(user_aggregated_activity_path):
-        logging.error(f"User data not found: U.npy ({user_U_path}) / netflix_aggregated.npy ({user_aggregated_activity_path})")
+    if U_mtime is None or (activity_mtime is None and legacy_activity_mtime is None):
+        logging.error(f"User data not found: U.npy ({user_U_path}) / netflix_aggregated.npz in {local_path}")
         return None, None
 
-    user_U = np.load(user_U_path)
-    global_V = np.load(global_V_path)
-    user_aggregated_activity = np.load(user_aggregated_activity_path, allow_pickle=True).copy()
+    # Same model files, activity, vocabulary and clicks as last time: the result is unchanged.
+    global _last_recommendations
+    cache_key = (
+        local_path,
+        exclude_watched,
+        tuple(additional_watched or ()),
+        V_mtime, U_mtime, activity_mtime, legacy_activity_mtime, titles_mtime,
+    )
+    cached = _last_recommendations
+    if cached is not None and cached[0] == cache_key and cached[1] is tv_vocab:
+        logging.info("Model files and activity unchanged; reusing the previous recommendations.")
+        # Fresh lists, since callers sort them in place
+        return list(cached[2]), list(cached[3])
+
+    # U is tiny, so rather than mapping it, reuse the copy cached by the last load/training.
+    user_U = load_user_matrix(user_U_dir)
+    # Mapped read-only: scoring only reads V, so its pages stay shared with the OS page cache.
+    global_V = np.load(global_V_path, mmap_mode="r")
+    user_aggregated_activity = to_activity_columns(load_participant_activity(local_path))
     
-    # Treat click-history items as "watched" by adding them to the activity list.
-    # `compute_recommendations()` expects an iterable of rows: (title, week, n_watched, rating).
+    # Treat click-history items as "watched" by appending them to the activity columns
+    # (week 0, watched once, rating 3.0).
     if additional_watched:
-        new_rows = []
-        for item_name in additional_watched:
-            if not item_name:
-                continue
-            new_rows.append([item_name, 0, 1, 3.0])
-        if new_rows:
-            extra = np.array(new_rows, dtype=object)
-            user_aggregated_activity = (
-                np.vstack([user_aggregated_activity, extra])
-                if user_aggregated_activity.size
-                else extra
-            )
-            logging.debug(f"Added {len(new_rows)} click history items to aggregated activity.")
+        new_titles = [item_name for item_name in additional_watched if item_name]
+        if new_titles:
+            n_new = len(new_titles)
+            extra = {
+                "title": np.array(new_titles, dtype=object),
+                "week": np.zeros(n_new, dtype=ACTIVITY_DTYPES["week"]),
+                "n_watched": np.ones(n_new, dtype=ACTIVITY_DTYPES["n_watched"]),
+                "rating": np.full(n_new, 3.0, dtype=ACTIVITY_DTYPES["rating"]),
+            }
+            user_aggregated_activity = {
+                name: np.concatenate([column, extra[name]])
+                for name, column in user_aggregated_activity.items()
+            }
+            logging.debug(f"Added {n_new} click history items to aggregated activity.")
 
     raw_recommendations, reranked_recommendations = compute_recommendations(
         user_U, global_V, tv_vocab, user_aggregated_activity, exclude_watched=exclude_watched,
         score_normalization=DISPLAY_SCORE_METHOD
     )
 
+    if not raw_recommendations and not reranked_recommendations:
+        # Nothing to enrich (e.g. everything in the vocabulary is already watched)
+        _last_recommendations = (cache_key, tv_vocab, [], [])
+        return [], []
+
     # Use augmented_titles.csv as the single source of data with semicolon separator
     csv_file_path = DATA_DIR / "augmented_titles.csv"
     try:
-        df = pd.read_csv(csv_file_path, sep=';')
+        df = load_titles_metadata(csv_file_path)
     except Exception as e:
         logging.error(f"Unable to read CSV from {csv_file_path}. Error: {e}")
         return None, None
@@ -157,28 +220,41 @@ def local_recommendation(local_path, global_path, tv_vocab, exclude_watched=True
     logging.info("(Re-ranked) Recommended based on most recently watched:")
     reranked_data = get_recommendations_data(reranked_recommendations, df) 
 
-    return raw_data, reranked_data
+    _last_recommendations = (cache_key, tv_vocab, raw_data, reranked_data)
+    return list(raw_data), list(reranked_data)
 
 
-# Global computation status
+# Global computation status. Always replaced with a new dict, never updated in
+# place, so a reader holding the current one sees a consistent snapshot.
 computation_status = {"status": "idle", "message": "", "last_updated": None}
 _pending_click_history = []
 
 
+_RESULTS_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+_by_raw_score = itemgetter("raw_score")
+
+
+def _write_results_json(path, recommendations):
+    """Write a result file in one go via a temp file, so readers never see a partial JSON.
+
+    orjson writes NaN/inf as null (keeping the files strict JSON) and
+    serializes numpy scalars natively.
+    """
+    # Unique temp name in the same directory, so concurrent writers never share it
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps(recommendations, option=_RESULTS_JSON_OPTIONS))
+        os.replace(tmp_path, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+        raise
+
+
 def run_recommendation_computation():
     """Run the recommendation computation in the background."""
-    global computation_status, _pending_click_history
-    
-    def _sanitize_for_strict_json(obj):
-        if isinstance(obj, float):
-            if math.isnan(obj) or math.isinf(obj):
-                return None
-            return obj
-        if isinstance(obj, dict):
-            return {k: _sanitize_for_strict_json(v) for k, v in obj.items()}
-        if isinstance(obj, list):
-            return [_sanitize_for_strict_json(v) for v in obj]
-        return obj
+    global computation_status
 
     try:
         computation_status = {
@@ -194,8 +270,7 @@ def run_recommendation_computation():
         tv_vocab = {}
         try:
             json_file_path = shared_folder_path / "vocabulary.json"
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                tv_vocab = json.load(f)
+            tv_vocab = load_tv_vocabulary(json_file_path)
         except FileNotFoundError:
             # Check if the shared folder exists at all
             if not shared_folder_path.exists():
@@ -251,14 +326,13 @@ def run_recommendation_computation():
         
         os.makedirs(os.path.dirname(raw_results_path), exist_ok=True)
 
-        raw_recommendations = _sanitize_for_strict_json(raw_recommendations)
-        reranked_recommendations = _sanitize_for_strict_json(reranked_recommendations)
+        # Stored best-first, so readers can serve the lists as they are
+        raw_recommendations.sort(key=_by_raw_score, reverse=True)
+        reranked_recommendations.sort(key=_by_raw_score, reverse=True)
 
-        with open(raw_results_path, 'w', encoding="utf-8") as f:
-            json.dump(raw_recommendations, f, indent=4, allow_nan=False)
-        
-        with open(reranked_results_path, 'w', encoding="utf-8") as f:
-            json.dump(reranked_recommendations, f, indent=4, allow_nan=False)
+        _write_results_json(raw_results_path, raw_recommendations)
+        _write_results_json(reranked_results_path, reranked_recommendations)
+        recommendations_exist.cache_clear()
         
         computation_status = {
             "status": "ready",
@@ -298,12 +372,44 @@ def run_recommendation_computation():
         }
 
 
+# Single worker: computations queue up instead of writing the result files concurrently.
+# Every trigger (API and FL workflow) goes through submit_recommendation_computation.
+_computation_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recommendations")
+_computation_lock = threading.Lock()
+# Last submitted computation (a Future), or None
+_queued_computation = None
+
+
+def submit_recommendation_computation():
+    """Queue `run_recommendation_computation` on a background thread and return its Future.
+
+    If a computation is already queued but hasn't started, no second one is
+    added: the queued one reads the inputs when it starts, so it covers both.
+    """
+    global computation_status, _queued_computation
+    with _computation_lock:
+        queued = _queued_computation
+        if queued is not None and not queued.running() and not queued.done():
+            return queued
+        # Report "computing" right away, so a status poll never sees the previous result as current.
+        computation_status = {
+            "status": "computing",
+            "message": "Recommendation computation queued...",
+            "last_updated": datetime.now().isoformat()
+        }
+        _queued_computation = _computation_executor.submit(run_recommendation_computation)
+        return _queued_computation
+
+
 def get_computation_status():
-    """Get current computation status."""
-    return computation_status
+    """Get a copy of the current computation status."""
+    return dict(computation_status)
 
 
 def set_pending_click_history(history):
-    """Set pending click history for recommendation enhancement."""
-    global _pending_click_history
-    _pending_click_history = history
+    """Set pending click history for recommendation enhancement.
+
+    The items are copied into the module's list (never rebound), so clearing it
+    after a computation leaves the caller's list alone.
+    """
+    _pending_click_history[:] = history or []
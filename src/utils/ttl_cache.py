@@ -0,0 +1,46 @@
+"""Time-based memoization for cheap-but-frequent lookups."""
+
+import functools
+import threading
+import time
+
+
+def ttl_cache(seconds: float):
+    """
+    Cache a function's result per arguments for `seconds`.
+
+    Meant for filesystem probes behind endpoints the UI polls (e.g. /status):
+    a short TTL trades a little freshness for far fewer stat() calls. Code
+    that changes the underlying state should call `func.cache_clear()`.
+    """
+
+    def decorator(func):
+        cache = {}
+        lock = threading.Lock()
+        # Bumped by cache_clear(); a result computed across a clear may be
+        # stale, so it is returned but not stored.
+        generation = [0]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            entry = cache.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+            started_generation = generation[0]
+            value = func(*args, **kwargs)
+            with lock:
+                if generation[0] == started_generation:
+                    cache[key] = (now + seconds, value)
+            return value
+
+        def cache_clear():
+            with lock:
+                generation[0] += 1
+                cache.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
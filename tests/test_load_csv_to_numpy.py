@@ -0,0 +1,20 @@
+"""Tests for load_csv_to_numpy."""
+
+from src.services.federated_learning import load_csv_to_numpy
+
+
+def _write(tmp_path, text):
+    path = tmp_path / "NetflixViewingHistory.csv"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_title_only_csv_returns_no_rows(tmp_path):
+    rows = load_csv_to_numpy(_write(tmp_path, "Title\nFoo\n"))
+    assert rows.shape == (0, 2)
+
+
+def test_short_and_blank_rows_are_skipped(tmp_path):
+    text = 'Title,Date\nFoo,01/02/2024\nBar\n\n  ,01/02/2024\n"Baz: Season 1",03/04/2024\n'
+    rows = load_csv_to_numpy(_write(tmp_path, text))
+    assert rows.tolist() == [["Foo", "01/02/2024"], ["Baz: Season 1", "03/04/2024"]]